@@ -0,0 +1,104 @@
+"""
+    Stress test of concurrent linting in one process
+
+    A set of sources (benchmarks/sample.idp, generated programs of
+    different sizes and a few broken programs) is linted serially with
+    folint.lint_source, and then many times concurrently: by a pool of
+    threads, and by asyncio tasks in an executor.  Every concurrent result
+    must be the same as the serial one.
+
+    usage: python benchmarks/concurrency.py [--threads N] [--rounds N] [--seed N]
+
+    Exits with status 1 when a concurrent result differs, so that it can be
+    used in CI.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generate import generate  # noqa: E402
+
+from folint import lint_source  # noqa: E402
+from folint.SCA import load_parser  # noqa: E402
+
+SAMPLE = os.path.join(ROOT, "benchmarks", "sample.idp")
+
+
+def sources():
+    """Dict[str, str]: the programs to lint, by name"""
+    with open(SAMPLE) as f:
+        sample = f.read()
+    out = {"sample": sample,
+           "sample-broken": sample.replace("}", "", 1),         # syntax error
+           "sample-truncated": sample[:len(sample) // 2]}
+    for depth in (1, 3, 6):
+        for definitions in (1, 4):
+            code = generate(depth=depth, definitions=definitions, rules=3)
+            out[f"generated-d{depth}-r{definitions}"] = code
+            out[f"generated-d{depth}-r{definitions}-unused"] = code.replace(": ", ": ~", 1)
+    return out
+
+
+def lint_one(name, code):
+    return name, lint_source(code, filename=name, extra=True)
+
+
+def threaded(jobs, threads):
+    with ThreadPoolExecutor(threads) as pool:
+        return list(pool.map(lambda job: lint_one(*job), jobs))
+
+
+async def tasks(jobs, threads):
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(threads) as pool:
+        return await asyncio.gather(*(loop.run_in_executor(pool, lint_one, name, code)
+                                      for name, code in jobs))
+
+
+def check(results, expected):
+    """the names of the sources whose result differs from the serial run"""
+    return sorted({name for name, found in results if found != expected[name]})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='folint concurrency stress test')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--rounds', type=int, default=5, help='times every source is linted, per mode')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    load_parser()
+    programs = sources()
+    start = time.perf_counter()
+    expected = dict(lint_one(name, code) for name, code in programs.items())
+    serial = time.perf_counter() - start
+    print(f"serial      {len(programs):4} sources {serial*1000:9.1f} ms"
+          f"  ({sum(map(len, expected.values()))} findings)")
+
+    rng = random.Random(args.seed)
+    jobs = list(programs.items()) * args.rounds
+    failed = set()
+    for mode, run in (("threads", lambda: threaded(jobs, args.threads)),
+                      ("asyncio", lambda: asyncio.run(tasks(jobs, args.threads)))):
+        rng.shuffle(jobs)
+        start = time.perf_counter()
+        results = run()
+        elapsed = time.perf_counter() - start
+        wrong = check(results, expected)
+        failed.update(wrong)
+        print(f"{mode:11} {len(jobs):4} lints   {elapsed*1000:9.1f} ms"
+              f"  {'ok' if not wrong else 'DIFFERENT: ' + ', '.join(wrong)}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
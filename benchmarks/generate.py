@@ -0,0 +1,120 @@
+"""
+    Generator of synthetic FO(·) programs, to measure how folint scales
+
+    The parameters are:
+
+        types       number of enumerated types T0, T1, ...
+        elements    number of constants of each enumerated type
+        symbols     number of predicates and functions (alternating)
+        range       size of the type Num := {0..range-1}; the structure
+                    enumerates size : Num -> Num partially
+        tuples      number of tuples in the enumeration of each function
+                    f_i : Ti * Ti -> Tj in the structure (at most elements²)
+        depth       nesting of quantifiers in the constraints
+        definitions number of definitions in the theory
+        rules       number of rules per definition
+
+    usage: python benchmarks/generate.py [--types N] [--symbols N] ... > model.idp
+"""
+
+import argparse
+
+DEFAULTS = {"types": 4, "elements": 5, "symbols": 8, "range": 10, "tuples": 10,
+            "depth": 2, "definitions": 2, "rules": 2}
+
+
+_range = range  # `range` is ook een parameter van generate()
+
+
+def generate(types=4, elements=5, symbols=8, range=10, tuples=10,
+             depth=2, definitions=2, rules=2):
+    """returns the source code of a synthetic FO(·) program
+
+    See the module docstring for the meaning of the arguments.
+    """
+    typ = [f"T{t}" for t in _range(max(types, 1))]
+    return _program(typ, max(elements, 1), symbols, range, tuples, depth, definitions, rules)
+
+
+def _constants(t, elements):
+    return [f"{t.lower()}_{i}" for i in _range(elements)]
+
+
+def _program(typ, elements, symbols, size, tuples, depth, definitions, rules):
+    out = ["vocabulary V {"]
+    for t in typ:
+        out.append(f"    type {t} := {{{', '.join(_constants(t, elements))}}}")
+    out.append(f"    type Num := {{0..{max(size, 1) - 1}}}")
+
+    predicates, functions = [], []      # (naam, type van het argument)
+    for i in _range(symbols):
+        t = typ[i % len(typ)]
+        if i % 2 == 0:
+            predicates.append((f"p{i}", t))
+            out.append(f"    p{i} : {t} -> Bool")
+        else:
+            functions.append((f"f{i}", t, typ[(i + 1) % len(typ)]))
+            out.append(f"    f{i} : {t} * {t} -> {typ[(i + 1) % len(typ)]}")
+    out.append("    size : Num -> Num")
+    for d in _range(definitions):
+        out.append(f"    d{d} : {typ[0]} -> Bool")
+    out.append("}")
+    out.append("")
+
+    out.append("theory T:V {")
+    for level in _range(1, depth + 1):
+        # !x1 in T0: !x2 in T1: ... : p(x1) | ... | p(xn).
+        variables = [(f"x{i}", typ[i % len(typ)]) for i in _range(level)]
+        quantees = " ".join(f"!{x} in {t}:" for x, t in variables)
+        atoms = [_atom(x, t, predicates) for x, t in variables]
+        out.append(f"    {quantees} {' | '.join(atoms)}.")
+    for name, t, u in functions:
+        out.append(f"    !x in {t}: {name}(x, x) ~= {_constants(u, elements)[0]} | {name}(x, x) = {_constants(u, elements)[0]}.")
+    out.append("    !n in Num: size(n) >= 0.")
+    for d in _range(definitions):
+        out.append("    {")
+        constants = _constants(typ[0], elements)
+        for r in _range(rules):
+            body = f"x ~= {constants[r % elements]}"
+            if predicates:
+                body += f" & {_atom('x', typ[0], predicates)}"
+            out.append(f"        !x in {typ[0]}: d{d}(x) <- {body}.")
+        out.append("    }")
+    out.append("}")
+    out.append("")
+
+    out.append("structure S:V {")
+    for name, t, u in functions:
+        domain = [(a, b) for a in _constants(t, elements) for b in _constants(t, elements)]
+        values = _constants(u, elements)
+        enum = [f"({a}, {b}) -> {values[i % elements]}" for i, (a, b) in enumerate(domain[:tuples])]
+        if enum:
+            out.append(f"    {name} := {{{', '.join(enum)}}}.")
+    out.append("    size := {0 -> 0}.")
+    out.append("}")
+    out.append("")
+
+    out.append("procedure main() {")
+    out.append("    print(model_expand(T,S))")
+    out.append("}")
+    return "\n".join(out) + "\n"
+
+
+def _atom(x, t, predicates):
+    """an atom about variable `x` of type `t`"""
+    for name, typ in predicates:
+        if typ == t:
+            return f"{name}({x})"
+    return f"{x} = {x}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='generate a synthetic FO(·) program')
+    for name, default in DEFAULTS.items():
+        parser.add_argument(f'--{name}', type=int, default=default)
+    args = parser.parse_args()
+    print(generate(**vars(args)), end="")
+
+
+if __name__ == "__main__":
+    main()
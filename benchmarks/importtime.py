@@ -0,0 +1,79 @@
+"""
+    Startup budget of the folint CLI, measured with `python -X importtime`
+
+    Every scenario runs in a fresh interpreter, a few times; the median of
+    the total import time, minus that of an empty interpreter (`-c pass`),
+    is compared with the budget in importtime_budget.json.  Modules listed
+    as `forbidden` for a scenario may not be imported at all (e.g. textX
+    for `folint --help`).
+
+    usage: python benchmarks/importtime.py [--runs N] [--scale X]
+
+    Exits with status 1 when a budget is exceeded or a forbidden module is
+    imported, so that it can be used in CI.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "importtime_budget.json")
+SAMPLE = os.path.join(ROOT, "benchmarks", "sample.idp")
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def importtime(argv):
+    """runs `python -X importtime argv` and returns {module: cumulative µs} of the top-level imports"""
+    out = subprocess.run([sys.executable, "-X", "importtime", *argv],
+                         capture_output=True, text=True, cwd=ROOT)
+    modules, top = {}, {}
+    for line in out.stderr.splitlines():
+        m = LINE.match(line)
+        if m:
+            modules[m[4]] = int(m[2])
+            if len(m[3]) == 1:  # direct import van het script
+                top[m[4]] = int(m[2])
+    return modules, sum(top.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='folint startup budget')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='multiply the budgets, for slow machines')
+    args = parser.parse_args()
+
+    with open(BUDGET) as f:
+        budget = json.load(f)
+
+    baseline = statistics.median(importtime(["-c", "pass"])[1] for _ in range(args.runs)) / 1000
+    print(f"     {'baseline':12} {baseline:7.1f} ms (python -c pass)")
+    failed = False
+    for name, scenario in budget.items():
+        argv = [a.replace("{sample}", SAMPLE) for a in scenario["argv"]]
+        totals, modules = [], {}
+        for _ in range(args.runs):
+            modules, total = importtime(argv)
+            totals.append(total)
+        median = statistics.median(totals) / 1000 - baseline
+        limit = scenario["budget_ms"] * args.scale
+        forbidden = [m for m in scenario.get("forbidden", []) if m in modules]
+        ok = median <= limit and not forbidden
+        failed = failed or not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {name:12} {median:7.1f} ms (budget {limit:.0f} ms)"
+              + (f"  forbidden imports: {', '.join(forbidden)}" if forbidden else ""))
+        if not ok:
+            slowest = sorted(modules.items(), key=lambda m: -m[1])[:5]
+            for module, us in slowest:
+                print(f"       {us/1000:7.1f} ms  {module}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
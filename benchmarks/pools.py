@@ -0,0 +1,128 @@
+"""
+    Worker pool benchmark: the start methods of `folint -j`
+
+    A corpus of generated programs is linted in a number of batches (as
+    in watch mode or the daemon), with the worker processes started by:
+
+        spawn             a new pool per batch; every worker imports
+                          textX and builds the idpparser metamodel
+        fork              a new pool per batch, forked before the parser
+                          is loaded (so every worker still builds it)
+        fork-preload      the parser is loaded once, the workers are forked
+                          from this process; the pool is reused
+        forkserver        the fork server loads the parser once, the
+                          workers are forked from it; the pool is reused
+                          (the default of folint)
+
+    Every mode runs in a fresh interpreter.  The first batch includes the
+    start of the pool; the next ones show the reuse.
+
+    usage: python benchmarks/pools.py [--files N] [--processes N] [--batches N]
+
+    Exits with status 1 when the modes do not find the same warnings/errors.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import Namespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# mode: (start method, preload, pool hergebruiken)
+MODES = {"spawn": ("spawn", False, False),
+         "fork": ("fork", False, False),
+         "fork-preload": ("fork", True, True),
+         "forkserver": ("forkserver", True, True)}
+
+
+def corpus(folder, files, seed):
+    """writes `files` generated programs of different sizes to `folder`"""
+    from generate import generate
+    rng = random.Random(seed)
+    paths = []
+    for i in range(files):
+        code = generate(types=rng.randint(2, 3), elements=rng.randint(2, 5),
+                        symbols=rng.randint(2, 6), tuples=rng.randint(2, 8),
+                        depth=rng.randint(1, 2), definitions=1, rules=1)
+        path = os.path.join(folder, f"model{i:04}.idp")
+        with open(path, "w") as f:
+            f.write(code)
+        paths.append(path)
+    return paths
+
+
+def child(mode, folder, processes, batches):
+    """runs in a fresh interpreter: lints the corpus `batches` times, prints the
+    times and the number of findings per file as JSON"""
+    from folint.batch import close_pools, run_batch
+    from folint.SCA import PRELOAD, lint_worker
+    method, preload, reuse = MODES[mode]
+    args = Namespace(AST=False, extra=False, filename=False, block_jobs=1, fail_fast=False,
+                     max_findings=None, rules=None, budget_ms=None, profile=False,
+                     cache_dir=None, summary=False, baseline=None, write_baseline=None)
+    files = sorted(os.path.join(folder, f) for f in os.listdir(folder))
+    jobs = [(f, args, None, None) for f in files]
+    times, aantallen = [], None
+    for _ in range(batches):
+        start = time.perf_counter()
+        results = list(run_batch(lint_worker, jobs, processes, method,
+                                 PRELOAD if preload else ()))
+        if not reuse:
+            close_pools()
+        times.append(time.perf_counter() - start)
+        aantallen = [r[2] for r in results]
+    print(json.dumps({"times": times, "aantallen": aantallen}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='folint worker pool benchmark')
+    parser.add_argument('--files', type=int, default=40)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--batches', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--corpus', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child, args.corpus, args.processes, args.batches)
+        return
+
+    import multiprocessing
+    available = multiprocessing.get_all_start_methods()
+    with tempfile.TemporaryDirectory() as folder:
+        corpus(folder, args.files, args.seed)
+        print(f"{args.files} files, {args.processes} processes, {args.batches} batches")
+        print(f"{'mode':14} {'first batch':>12} {'next batches':>13} {'total':>10}")
+        expected, failed = None, False
+        for mode in args.modes:
+            if MODES[mode][0] not in available:
+                print(f"{mode:14} not available")
+                continue
+            out = subprocess.run([sys.executable, __file__, "--child", mode, "--corpus", folder,
+                                  "--processes", str(args.processes),
+                                  "--batches", str(args.batches)],
+                                 check=True, capture_output=True, text=True, cwd=ROOT)
+            result = json.loads(out.stdout.splitlines()[-1])
+            times = result["times"]
+            rest = f"{statistics.median(times[1:])*1000:10.0f} ms" if len(times) > 1 else ""
+            print(f"{mode:14} {times[0]*1000:9.0f} ms {rest:>13} {sum(times)*1000:7.0f} ms")
+            if expected is None:
+                expected = result["aantallen"]
+            elif result["aantallen"] != expected:
+                print(f"{mode:14} DIFFERENT results")
+                failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
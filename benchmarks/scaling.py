@@ -0,0 +1,135 @@
+"""
+    Scaling benchmark: how folint scales with the size of a program
+
+    Every parameter of benchmarks/generate.py is varied in turn (the others
+    keep their default value).  For each generated program, the parse,
+    annotate, SCA_Check (per kind of block) and extra style check phases are
+    timed in-process with folint.profiling, over a few runs (median).
+
+    usage: python benchmarks/scaling.py [--quick] [--sweep NAME] [--runs N]
+                                        [--output FILE] [--compare OLD.json]
+
+    The results are saved as JSON (--output), so that two versions of
+    folint can be compared with --compare.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from argparse import Namespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generate import DEFAULTS, generate  # noqa: E402
+
+from folint import __version__, context, profiling  # noqa: E402
+from folint.report import Reporter  # noqa: E402
+from folint.SCA import lint, load_parser  # noqa: E402
+
+SWEEPS = {"types": [1, 2, 4, 8, 16, 32],
+          "symbols": [4, 16, 64, 256],
+          "range": [10, 100, 1000, 10000],
+          "tuples": [10, 100, 1000, 4000],
+          "depth": [1, 2, 4, 8, 16],
+          "definitions": [1, 4, 16, 64],
+          "rules": [1, 4, 16, 64, 256]}
+
+# de blokken van een gegenereerd programma
+KINDS = {"V": "vocabulary", "T": "theory", "S": "structure", "main": "procedure"}
+
+
+def params(sweep, value):
+    """the parameters of generate() for `value` of `sweep`"""
+    out = dict(DEFAULTS, **{sweep: value})
+    if sweep == "tuples":   # genoeg elementen voor `value` tuples
+        out["elements"] = max(out["elements"], math.ceil(math.sqrt(value)))
+    return out
+
+
+def measure(code):
+    """lints `code` once and returns {phase: seconds} and the node count"""
+    profiler = profiling.Profiler()
+    args = Namespace(AST=False, extra=True, filename=False, block_jobs=1,
+                     fail_fast=False, max_findings=None, rules=None, budget_ms=None,
+                     summary=False, baseline=None, write_baseline=None)
+    with context.run(profiler=profiler):
+        lint("synthetic.idp", args, code, reporter=Reporter())
+    times, nodes = {}, 0
+    for e in profiler.entries:
+        name = e.phase if e.block is None else f"{e.phase}:{KINDS.get(e.block, e.block)}"
+        times[name] = times.get(name, 0.0) + e.wall
+        if e.phase == "parse":
+            nodes = e.nodes or 0
+    times["total"] = sum(e.wall for e in profiler.entries)
+    return times, nodes
+
+
+def run(sweep, value, runs):
+    code = generate(**params(sweep, value))
+    measure(code)   # opwarmen
+    samples, nodes = [], 0
+    for _ in range(runs):
+        times, nodes = measure(code)
+        samples.append(times)
+    phases = sorted({p for s in samples for p in s})
+    return {"sweep": sweep, "value": value, "params": params(sweep, value),
+            "lines": code.count("\n"), "nodes": nodes,
+            "time": {p: statistics.median(s.get(p, 0.0) for s in samples) for p in phases}}
+
+
+def compare(old, new):
+    """prints the ratio new/old of the total time of the common measurements"""
+    before = {(r["sweep"], r["value"]): r for r in old["results"]}
+    print(f"\n{'sweep':12} {'value':>7} {'old ms':>9} {'new ms':>9} {'ratio':>6}"
+          f"   ({old['version']} -> {new['version']})")
+    for r in new["results"]:
+        o = before.get((r["sweep"], r["value"]))
+        if o:
+            a, b = o["time"]["total"], r["time"]["total"]
+            print(f"{r['sweep']:12} {r['value']:7} {a*1000:9.2f} {b*1000:9.2f} {b/a:6.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='folint scaling benchmark')
+    parser.add_argument('--sweep', action='append', choices=sorted(SWEEPS),
+                        help='parameter to vary (default: all); can be repeated')
+    parser.add_argument('--quick', action='store_true', help='only the smaller sizes')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--output', default='scaling.json', help='JSON file with the results')
+    parser.add_argument('--compare', help='JSON file of an earlier run, to compare with')
+    args = parser.parse_args()
+
+    load_parser()   # de grammatica telt niet mee
+    results = []
+    print(f"{'sweep':12} {'value':>7} {'nodes':>7} {'parse':>9} {'annotate':>9} "
+          f"{'check':>9} {'extra':>9} {'total ms':>9}")
+    for sweep in args.sweep or SWEEPS:
+        values = SWEEPS[sweep][:3] if args.quick else SWEEPS[sweep]
+        for value in values:
+            r = run(sweep, value, args.runs)
+            results.append(r)
+            t = r["time"]
+            part = lambda phase: sum(v for p, v in t.items() if p.split(":")[0] == phase) * 1000
+            print(f"{sweep:12} {value:7} {r['nodes']:7} {part('parse'):9.2f} {part('annotate'):9.2f} "
+                  f"{part('check'):9.2f} {part('extra'):9.2f} {t['total']*1000:9.2f}")
+
+    out = {"version": __version__, "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+           "python": platform.python_version(), "machine": platform.machine(),
+           "runs": args.runs, "defaults": DEFAULTS, "results": results}
+    with open(args.output, "w") as f:
+        json.dump(out, f, indent=1)
+    print(f"\nresults saved in {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+    Startup benchmark: time to build the idpparser metamodel
+    from Idp.tx, and from the compiled grammar (Idp.tx.pickle).
+
+    Every measurement runs in a fresh interpreter.
+
+    usage: python benchmarks/startup.py [--runs N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Grammar.py wordt rechtstreeks geladen: `import folint.ast_engine` bouwt de parser al
+MEASURE = """
+import importlib.util, json, sys, time
+spec = importlib.util.spec_from_file_location("Grammar", {grammar!r})
+Grammar = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(Grammar)
+from textx import metamodel_from_file
+start = time.perf_counter()
+if {compiled!r}:
+    Grammar.load_metamodel({dsl!r}, memoization=True)
+else:
+    metamodel_from_file({dsl!r}, memoization=True)
+print(json.dumps(time.perf_counter() - start))
+"""
+
+
+def measure(compiled):
+    grammar = os.path.join(ROOT, "folint", "ast_engine", "Grammar.py")
+    dsl = os.path.join(ROOT, "folint", "ast_engine", "Idp.tx")
+    code = MEASURE.format(grammar=grammar, dsl=dsl, compiled=compiled)
+    out = subprocess.run([sys.executable, "-c", code], check=True,
+                         capture_output=True, text=True, cwd=ROOT)
+    return json.loads(out.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='idpparser startup benchmark')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    measure(True)   # compileert de grammatica (in de user cache) als die er nog niet is
+    results = {}
+    for name, compiled in (("Idp.tx", False), ("compiled", True)):
+        times = [measure(compiled) for _ in range(args.runs)]
+        results[name] = statistics.median(times)
+        print(f"{name:10} median {results[name]*1000:7.1f} ms  (min {min(times)*1000:.1f} ms)")
+    print(f"saving     {(results['Idp.tx'] - results['compiled'])*1000:7.1f} ms"
+          f"  ({results['Idp.tx'] / results['compiled']:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,76 +1,349 @@
 # SCA.py
 import sys
+import io
 import re
 import argparse
 import time
-from fileinput import filename
-from textx import get_location
+from contextlib import redirect_stdout
 
-from .ast_engine.Parse import IDP
-from .ast_engine.utils import IDPZ3Error
+# textX en de idpparser worden pas geladen als er echt gelint moet worden:
+# --help, de daemon client en resultaten uit de cache hebben ze niet nodig
+from .batch import (expand_paths, missing, run_batch, run_limited, progress, Stopped, START_METHODS,
+                    default_method)
+from .report import REPORTERS, TextReporter, Recorder, make_reporter, replay
+from . import context, profiling
+from .profiling import phase, count
 
-def output(lijst,soort):
+STDIN = "<stdin>"   # naam van de broncode van `folint -`, zonder --stdin-filename
+PRELOAD = ("folint.ast_engine.Parse",)  # modules van de workers: textX en de idpparser metamodel
+
+def locatie(node):
+    """returns the line, colStart and colEnd of the AST node of a warning/error"""
+    from textx import get_location
+    location = get_location(node)
+    if hasattr(node, 'name'):
+        colEnd = location['col'] + len(node.name)
+    elif hasattr(node, 'annotations') and node.annotations is not None:
+        colEnd = location['col'] + len(node.annotations['reading'])
+    else:
+        colEnd = location['col']
+    return location['line'], location['col'], colEnd
+
+def lijnen(node):
+    """returns the first and last line of the AST node of a block"""
+    from textx import get_location, get_model
+    last, _ = get_model(node)._tx_parser.pos_to_linecol(node._tx_position_end)
+    return get_location(node)['line'], last
+
+def bron(node):
+    """returns the source text of the AST node, "" for None"""
+    from textx import get_model
+    return get_model(node).code[node._tx_position:node._tx_position_end] if node else ""
+
+def output(lijst,soort,reporter):
     """Output of error/warning in format 'warning/error: line .. - colStart .. - colEnd=> message' """
-    print(f"-- {soort} : aantal = {len(lijst)}")
-    for i in lijst:
-        location = get_location(i[0])
-        if hasattr(i[0], 'name'):
-            colEnd = location['col'] + len(i[0].name)
-        elif hasattr(i[0], 'annotations') and i[0].annotations is not None:
-            colEnd = location['col'] + len(i[0].annotations['reading'])
-        else:
-            colEnd = location['col']
-        if argfilename :
-            print(f"{filename}: {i[2]}: line {location['line']} - colStart {location['col']} - colEnd {colEnd} => {i[1]}")
-        else:
-            print(f"{i[2]}: line {location['line']} - colStart {location['col']} - colEnd {colEnd} => {i[1]}")
+    reporter.findings(soort, [i[:4] + i[5:] for i in lijst])
+
+class Genoeg(Exception):
+    """raised by Fouten.append to stop a check as soon as its limit is reached"""
+
+class Limiet(object):
+    """when the check of a file stops: at the first error (--fail-fast)
+    and/or after `max_findings` warnings and errors (--max-findings)"""
+
+    def __init__(self, fail_fast=False, max_findings=None):
+        self.fail_fast = fail_fast
+        self.max_findings = max_findings
+        self.aantal = 0     # gemelde fouten van de file tot nu toe
+        self.reden = None   # waarom er gestopt is
+
+    def rest(self):
+        """the number of findings that can still be reported, None if unlimited"""
+        return None if self.max_findings is None else self.max_findings - self.aantal
+
+    def neem(self, fouten):
+        """the findings of `fouten` within the limit; sets `reden` when it is reached"""
+        out = []
+        for fout in fouten:
+            if self.reden:
+                break
+            out.append(fout)
+            self.aantal += 1
+            if self.fail_fast and fout[-2] == "Error":
+                self.reden = "the first error (--fail-fast)"
+            elif self.max_findings is not None and self.aantal >= self.max_findings:
+                self.reden = f"{self.aantal} findings (--max-findings)"
+        return out
+
+class Op(Genoeg):
+    """raised by Fouten.aan when the time budget (--budget-ms) is used up"""
+
+class Budget(object):
+    """the time left for the checks of a file (--budget-ms), from the start of its lint
+
+    Attributes:
+        ms (int): the budget, in milliseconds
+        blokken (List[str]): the blocks whose check did not complete, in the current pass
+    """
+
+    def __init__(self, ms):
+        self.ms = ms
+        self.deadline = time.perf_counter() + ms / 1000
+        self.blokken = []
+
+    def op(self):
+        """whether the budget is used up"""
+        return time.perf_counter() >= self.deadline
+
+class Fouten(list):
+    """the list that SCA_Check (or extra_check) appends its findings to
 
-def doe_de_check(A):
-    fouten = []
-    A.SCA_Check(fouten)
+    The checks only run for the rules that are selected in the current run
+    (`aan()`, see rules.py); findings of other rules or severities are not
+    kept.  It raises Genoeg as soon as the limit is reached, so that the
+    rest of the AST is not traversed, and Op when the `budget` is used up."""
+
+    def __init__(self, limiet=None, budget=None):
+        super().__init__()
+        self.fail_fast = limiet is not None and limiet.fail_fast
+        self.rest = None if limiet is None else limiet.rest()
+        self.selectie = context.current().rules
+        self.budget = budget
+
+    def aan(self, rule):
+        """whether the check of `rule` must run"""
+        if self.budget is not None and self.budget.op():
+            raise Op()
+        return self.selectie is None or rule in self.selectie.rules
+
+    def append(self, fout):
+        if self.selectie is not None and (fout[-1], fout[-2]) not in self.selectie.pairs:
+            return
+        super().append(fout)
+        if ((self.fail_fast and fout[-2] == "Error")    # soort is het voorlaatste element
+                or (self.rest is not None and len(self) >= self.rest)):
+            raise Genoeg()
+
+class Gevonden(list):
+    """the findings of check(); `onvolledig` if its budget was used up before the end,
+    and the `vingerafdrukken` of the findings if the run computes them (see baseline.py)"""
+    onvolledig = False
+    vingerafdrukken = None
+
+def check(A, limiet=None, budget=None):
+    """runs SCA_Check on block A, until the `limiet` (if any) is reached
+    or the `budget` (if any) is used up
+
+    Returns:
+        Gevonden: line, colStart, colEnd, message, soort and rule of the warnings/errors
+    """
+    fouten = Fouten(limiet, budget)
+    onvolledig = False
+    with phase("check", A.name) as entry:
+        try:
+            A.SCA_Check(fouten)
+        except Op:
+            onvolledig = True
+        except Genoeg:
+            pass
+    count(entry, A)
+    if context.current().locations:
+        gevonden = Gevonden(locatie(i[0]) + i[1:] for i in fouten)
+    else:   # --summary: enkel tellen
+        gevonden = Gevonden((None, None, None) + i[1:] for i in fouten)
+    gevonden.onvolledig = onvolledig
+    if context.current().fingerprints:
+        from .baseline import fingerprint
+        gevonden.vingerafdrukken = [fingerprint(i[3], A.name, bron(i[0])) for i in fouten]
+    return gevonden
+
+def doe_de_check(A,reporter,fouten=None):
+    if fouten is None:
+        fouten = check(A)
     warnings = []
     errors = []
     for i in fouten:            #splits warning en errors
-        if i[2] == "Warning":
+        if i[4] == "Warning":
             warnings.append(i)
         else :
             errors.append(i)
-    output(errors,"Error")      #output errors
-    output(warnings,"Warning")  #output warnings
+    output(errors,"Error",reporter)      #output errors
+    output(warnings,"Warning",reporter)  #output warnings
     return len(fouten)
 
-def sca(idp):
+def blocks(idp):
+    """yields the kind and AST node of the blocks of idp, in the order they are checked"""
+    for soort, namen in (("Vocabulary", idp.vocabularies), ("Structure", idp.structures),
+                         ("Theory", idp.theories), ("Procedure", idp.procedures)):
+        for naam in namen:
+            yield soort, idp.get_blocks(naam)[0]
+
+def bronnen(idp, soort, block):
+    """returns the source text of the block, and of the blocks its check depends on"""
+    if soort == "Vocabulary":   # types kunnen in een structure geïnterpreteerd worden
+        depends = [bron(s) for s in idp.structures.values() if s.vocab_name == block.name]
+    elif soort == "Procedure":  # model_check(T, S) gebruikt bloknamen
+        depends = sorted(idp.theories) + sorted(idp.structures)
+    else:
+        depends = [bron(idp.vocabularies.get(block.vocab_name))]
+    return [bron(block), *depends]
+
+_blokken = []   # de blokken die een geforkte worker van check_blocks() controleert
+_limiet = None  # en hun Limiet
+_budget = None  # en hun Budget
+
+def _init_forked(blokken, run, limiet, budget):
+    global _blokken, _limiet, _budget
+    _blokken, _limiet, _budget = blokken, limiet, budget
+    context.activate(run)
+
+def _check_forked(i):
+    profiler = profiling.active()
+    start = len(profiler.entries) if profiler else 0
+    fouten = check(_blokken[i], _limiet, _budget)
+    entries = [e.as_dict() for e in profiler.entries[start:]] if profiler else None
+    return fouten, entries
+
+def check_blocks(blokken, jobs=1, limiet=None, budget=None):
+    """runs SCA_Check on each block, with `jobs` workers
+
+    The blocks only read the annotated AST while they are checked.  The
+    workers are forked processes, which share the AST copy-on-write, or
+    threads when fork is not available, in a daemonic worker process
+    (which cannot have children) or when other threads are running (e.g.
+    concurrent lints in a server, which fork does not copy).
+
+    With a `limiet`, every block stops at the limit left when it starts
+    (the blocks of parallel workers may thus find more, see sca()); when
+    the caller stops, the blocks that did not start yet are cancelled.
+    With a `budget`, every block stops when it is used up.
+
+    Yields:
+        the result of check() of each block, in the order of `blokken`
+    """
+    if jobs <= 1 or len(blokken) <= 1:
+        for blok in blokken:
+            yield check(blok, limiet, budget)
+        return
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    import threading
+    from contextvars import copy_context
+    if ("fork" not in multiprocessing.get_all_start_methods()
+            or multiprocessing.current_process().daemon
+            or threading.active_count() > 1):
+        contexts = [copy_context() for _ in blokken]    # de run van deze thread, per blok
+        with ThreadPoolExecutor(jobs) as pool:
+            try:
+                yield from pool.map(lambda c, b: c.run(check, b, limiet, budget), contexts, blokken)
+            finally:
+                pool.shutdown(cancel_futures=True)
+        return
+    with ProcessPoolExecutor(min(jobs, len(blokken)),
+                             mp_context=multiprocessing.get_context("fork"),
+                             initializer=_init_forked,
+                             initargs=(blokken, context.current(), limiet, budget)) as pool:
+        try:
+            for fouten, entries in pool.map(_check_forked, range(len(blokken))):
+                if entries:
+                    profiling.active().extend(entries)
+                yield fouten
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+def gewijzigde_blokken(idp, lines):
+    """returns the first and last line of the blocks of idp that overlap with
+    the line ranges `lines`, by name"""
+    from .changes import overlaps
+    out = {}
+    for namen in (idp.vocabularies, idp.structures, idp.theories, idp.procedures):
+        for naam in namen:
+            first, last = lijnen(idp.get_blocks(naam)[0])
+            if overlaps(first, last, lines):
+                out[naam] = (first, last)
+    return out
+
+def sca(idp,reporter,jobs=1,selectie=None,limiet=None,budget=None,basis=None):
+    """checks the blocks of idp (only those named in `selectie`, if given),
+    until the `limiet` (if any) is reached
+
+    With a `budget`, the blocks whose check did not complete are added to
+    `budget.blokken`; those without findings are not reported.  With a
+    baseline Entry `basis`, the unchanged blocks are not checked (nor
+    reported) and only the new findings are reported."""
     aantal = 0
-    print("\n---------- Vocabulary Check ----------")
-    for v in idp.vocabularies:      #check all vocabularies
-        print("-----",v)
-        V = idp.get_blocks(v)       #get vocabulary block
-        aantal += doe_de_check(V[0])          #check
-    print("\n---------- Structure Check ----------")
-    for s in idp.structures:        #check all structures
-        print("-----",s)
-        V = idp.get_blocks(s)       #get structure block
-        aantal += doe_de_check(V[0])          #check
-    print("\n---------- Theory Check ----------")
-    for t in idp.theories:          #check all theories
-        print("-----",t)
-        T = idp.get_blocks(t)       #get theory block
-        aantal += doe_de_check(T[0])          #check
-    print("\n---------- Procedure Check ----------")
-    for p in idp.procedures:        #check all procedures
-        print("-----",p)
-        P = idp.get_blocks(p)       #get procedure block
-        aantal += doe_de_check(P[0])          #check
+    secties = [("Vocabulary", idp.vocabularies),   #check all vocabularies
+               ("Structure", idp.structures),      #check all structures
+               ("Theory", idp.theories),           #check all theories
+               ("Procedure", idp.procedures)]      #check all procedures
+    if selectie is not None:
+        secties = [(soort, [n for n in namen if n in selectie]) for soort, namen in secties]
+    if basis is not None:
+        from .baseline import digest
+        hashes = {naam: digest(soort, *bronnen(idp, soort, idp.get_blocks(naam)[0]))
+                  for soort, namen in secties for naam in namen}
+        secties = [(soort, [n for n in namen if not basis.unchanged(n, hashes[n])])
+                   for soort, namen in secties]
+    blokken = [idp.get_blocks(naam)[0] for _, namen in secties for naam in namen]
+    # met een baseline telt de limiet enkel de nieuwe fouten
+    resultaten = check_blocks(blokken, jobs, limiet if basis is None else None, budget)      #check, in de volgorde van de blokken
+    for soort, namen in secties:
+        if limiet and limiet.reden:
+            break
+        gemeld = budget is None     #met een budget: de sectie pas bij het eerste gemelde blok
+        if gemeld:
+            reporter.section(soort)
+        for naam in namen:
+            if limiet and limiet.reden:
+                break
+            if budget is None:
+                reporter.block(naam)
+            fouten = next(resultaten)
+            onvolledig = fouten.onvolledig
+            if basis is not None:
+                fouten = basis.new(naam, hashes[naam], fouten, fouten.vingerafdrukken)
+            if budget is not None:
+                if onvolledig:
+                    budget.blokken.append(naam)
+                    if not fouten:
+                        continue
+                if not gemeld:
+                    reporter.section(soort)
+                    gemeld = True
+                reporter.block(naam)
+            if limiet:
+                fouten = limiet.neem(fouten)    #parallelle blokken kunnen te veel gevonden hebben
+            aantal += doe_de_check(None,reporter,fouten)
+    resultaten.close()
     return aantal
 
-def extra(file):
-    f = open(file, "r")     #open file
-    fouten = []
-    extra_check(f,fouten)   #controleer op extra style guide fouten
-    extra_output(fouten)    #output de gevonden fouten
-    f.close()               #close file
+def extra(file, reporter, code=None, spans=None, limiet=None, basis=None):
+    fouten = Fouten(limiet if spans is None and basis is None else None)
+    with phase("extra"):
+        try:
+            if code is not None:    #broncode al ingelezen
+                extra_check(code.splitlines(keepends=True),fouten)
+            else:
+                with open(file, "r") as f:
+                    extra_check(f,fouten)   #controleer op extra style guide fouten
+        except Genoeg:
+            pass
+    if spans is not None:   #enkel de lijnen van de gewijzigde blokken
+        fouten = [i for i in fouten if any(a <= i[0] <= b for a, b in spans)]
+    if basis is not None:   #enkel de nieuwe fouten; de lijn is de tekst van de fout
+        from .baseline import fingerprint
+        lijnen = code.splitlines()
+        fouten = basis.new(None, None, fouten, [fingerprint(i[-1], None, lijnen[i[0]-1])
+                                                for i in fouten])
+    if limiet:
+        fouten = limiet.neem(fouten)
+    reporter.extra(fouten)  #output de gevonden fouten
     return len(fouten)
 
+def stijl(rules):
+    """whether one of the rules of the extra style guide check is selected"""
+    return rules is None or any(rule.startswith("style-") for rule in rules.rules)
+
 def extra_check(f,fouten) :
     pattern = re.compile("\s,\S?") # als voor de komma een spatie en na de komma geen of wel spatie
     pattern2 = re.compile("\/\/") # search voor comments
@@ -81,28 +354,33 @@ def extra_check(f,fouten) :
     lineNumber = 1
     help_lines = []
     duplicate_check = 0
+    komma, commentaar, regel, inspringen, consistent, dubbel = (fouten.aan(rule) for rule in (
+        "style-comma-spacing", "style-comment-line", "style-one-rule-per-line",
+        "style-indentation", "style-symbol-consistency", "style-duplicate-line"))
     for line in f:
         # style guide regel: spaties niet voor/wel na de komma
-        for match in re.finditer(pattern, line):
-            fouten.append((lineNumber,match.span()[0],match.span()[1],"Style guide, to much spaces","Warning"))
+        for match in (re.finditer(pattern, line) if komma else ()):
+            fouten.append((lineNumber,match.span()[0],match.span()[1],"Style guide, to much spaces","Warning","style-comma-spacing"))
 
         # style guide regel: commentaar op aparte lijnen
-        for match in re.finditer(pattern2, line):
+        for match in (re.finditer(pattern2, line) if commentaar else ()):
             if len(line[0:match.span()[0]].strip()) != 0:
-                fouten.append((lineNumber,match.span()[0],match.span()[1],"Style guide, comment on seperate line","Warning"))
+                fouten.append((lineNumber,match.span()[0],match.span()[1],"Style guide, comment on seperate line","Warning","style-comment-line"))
 
         # style guide regel: nieuwe regel op een nieuwe lijn
-        if line.count('.') > 1:
-            fouten.append((lineNumber,0,len(line),"Style guide, use new line for new rule","Warning"))
+        if regel and line.count('.') > 1:
+            fouten.append((lineNumber,0,len(line),"Style guide, use new line for new rule","Warning","style-one-rule-per-line"))
 
         # style guide regel: use indentation
-        if not(line.startswith('\t') or line.startswith('    ')):
+        if inspringen and not(line.startswith('\t') or line.startswith('    ')):
             keywords = ["vocabulary", "structure", "theory", "procedure","}"]
             if not(len(line.strip())==0 or any(word in line for word in keywords)):
-                fouten.append((lineNumber,0,4,"Style guide, wrong indentation","Warning"))
+                fouten.append((lineNumber,0,4,"Style guide, wrong indentation","Warning","style-indentation"))
 
         # style guide regel: Consistent gebruik van tekens in unicode of ASCII
-        if not(consistentie_help):
+        if not consistent:
+            pass
+        elif not(consistentie_help):
             if any(symbol in line for symbol in unicode_symbols):
                 consistentie = "unicode"
                 consistentie_help = True
@@ -111,97 +389,505 @@ def extra_check(f,fouten) :
                 consistentie_help = True
         else:
             if any(symbol in line for symbol in unicode_symbols) and any(symbol in line for symbol in ascii_symbols):
-                fouten.append((lineNumber,0,4,"Style guide, stay consistent in use of unicode or ASCII symbols","Warning"))
+                fouten.append((lineNumber,0,4,"Style guide, stay consistent in use of unicode or ASCII symbols","Warning","style-symbol-consistency"))
             elif any(symbol in line for symbol in unicode_symbols) and consistentie=="ASCII":
-                fouten.append((lineNumber,0,4,"Style guide, stay consistent in use of unicode or ASCII symbols","Warning"))
+                fouten.append((lineNumber,0,4,"Style guide, stay consistent in use of unicode or ASCII symbols","Warning","style-symbol-consistency"))
             elif any(symbol in line for symbol in ascii_symbols) and consistentie=="unicode":
-                fouten.append((lineNumber,0,4,"Style guide, stay consistent in use of unicode or ASCII symbols","Warning"))
+                fouten.append((lineNumber,0,4,"Style guide, stay consistent in use of unicode or ASCII symbols","Warning","style-symbol-consistency"))
 
         # style guide regel: Geen dezelfde regels/lijnen
         test_keywords = ["theory", "procedure"] #duplicates in structure en vocabulary worden door idp gemeld, net zoals duplicate bloknamen
-        if any(word in line for word in test_keywords) and duplicate_check==0:
+        if not dubbel:
+            pass
+        elif any(word in line for word in test_keywords) and duplicate_check==0:
             help_lines.append(line)
             duplicate_check = 1
         elif (duplicate_check==1 and len(line.strip()) != 0):
             if (line in help_lines):
-                fouten.append((lineNumber,0,len(line),"style guide, duplicate line","Warning"))
+                fouten.append((lineNumber,0,len(line),"style guide, duplicate line","Warning","style-duplicate-line"))
             else:
                 help_lines.append(line)
-        if ('}' in line and duplicate_check==1):
+        if (dubbel and '}' in line and duplicate_check==1):
             duplicate_check = 0
             help_lines = []
         lineNumber += 1
     return fouten
 
-def extra_output(lijst) :
-    """ Output of extra style guide warning in format 'warning: line .. - colStart .. - colEnd=> message' """
-    print(f"\n---------- Extra Style Guide Check: aantal = {len(lijst)} ----------")
-    for i in lijst:
-        if argfilename :
-            print(f"{filename}: {i[4]}: line {i[0]} - colStart {i[1]} - colEnd {i[2]} => {i[3]}")
+def progressief(file, idp, args, reporter, code, selectie, spans, limiet, budget, basis=None):
+    """checks idp with a time budget (--budget-ms): the rules of the cheapest
+    cost class first, for all blocks, then the next ones and the extra style
+    check while the budget lasts; the checks that did not complete are
+    reported as incomplete
+
+    Returns:
+        int: the number of warnings and errors found
+    """
+    from .rules import RULES, passes
+    aantal, onvolledig = 0, []
+    for i, (cost, rules) in enumerate(passes(args.rules)):
+        if limiet and limiet.reden:
+            break
+        reporter.message(f"\n---------- {cost.capitalize()} Rules ----------")
+        budget.blokken = []
+        with context.run(file, rules=rules):
+            # de goedkoopste regels altijd volledig
+            aantal += sca(idp, reporter, args.block_jobs, selectie, limiet,
+                          budget if i else None, basis)
+        if budget.blokken:
+            onvolledig.append((sorted(rules.rules), budget.blokken))
+    if args.extra and not (limiet and limiet.reden) and stijl(args.rules):
+        if budget.op():
+            style = args.rules.rules if args.rules else RULES
+            onvolledig.append((sorted(r for r in style if r.startswith("style-")), [None]))
         else:
-            print(f"{i[4]}: line {i[0]} - colStart {i[1]} - colEnd {i[2]} => {i[3]}")
+            aantal += extra(file, reporter, code, spans, limiet, basis)
+    if onvolledig:
+        reporter.incomplete(budget.ms, onvolledig)
+    return aantal
+
+def lint(file, args, code=None, parse=None, reporter=None, lines=None):
+    """lint one .idp file and report the results
+
+    Args:
+        file (str): path to the .idp file
+        args (argparse.Namespace): the command line options
+        code (str, optional): source code of the file; read from `file` if None
+        parse (Callable[[str], IDP], optional): parses the code, `IDP.from_str` if None
+        reporter (Reporter, optional): where to report the results to;
+            printed in the text format if None
+        lines (List[Tuple[int, int]], optional): only check the blocks that
+            overlap with these line ranges, e.g. the changed lines
+
+    Returns:
+        int: the number of warnings and errors found
+    """
+    from .ast_engine.Parse import IDP
+    from .ast_engine.utils import IDPZ3Error
+    from textx.exceptions import TextXError
+    if reporter is None:
+        reporter = TextReporter(sys.stdout, args.filename)
+        reporter.file(file)
+    totaal = 0
+    limiet = None
+    if args.fail_fast or args.max_findings is not None:
+        limiet = Limiet(args.fail_fast, args.max_findings)
+    budget = None if args.budget_ms is None else Budget(args.budget_ms)  # vanaf het parsen
+    basis = None    # de baseline van de file, zie baseline.py
+    if args.baseline or args.write_baseline:
+        from .baseline import Entry, load
+        basis = load(args.baseline).entry(file, args.rules) if args.baseline else Entry()
+    with context.run(file, rules=args.rules, locations=not args.summary,     # de toestand van deze run, zie context.py
+                     fingerprints=basis is not None):
+        try:
+            if code is not None or file.endswith(".idp"):     # broncode van stdin heeft al een naam
+                if basis is not None:
+                    if code is None:
+                        with open(file, "r") as source:
+                            code = source.read()
+                    if basis.file(code, args.extra and stijl(args.rules)) and not args.AST:
+                        reporter.total(0)   # ongewijzigd: geen nieuwe fouten
+                        return 0
+                with phase("parse") as entry:
+                    if code is None:
+                        idp = IDP.from_file(file)       # parse idp file to AST
+                    else:
+                        idp = (parse or IDP.from_str)(code)
+                count(entry, idp)
+                if args.AST:
+                    buffer = io.StringIO()
+                    with redirect_stdout(buffer):
+                        idp.printAST(0)             # print AST van file
+                    reporter.message(buffer.getvalue().removesuffix("\n"))
+                selectie = None if lines is None else gewijzigde_blokken(idp, lines)
+                spans = None if selectie is None else list(selectie.values())
+                if budget is None:
+                    totaal += sca(idp, reporter, args.block_jobs, selectie, limiet, basis=basis) # Voer SCA uit
+                    if args.extra and not (limiet and limiet.reden) and stijl(args.rules):
+                        totaal += extra(file, reporter, code, spans, limiet, basis)     # Extra style guide checking
+                else:
+                    totaal += progressief(file, idp, args, reporter, code, selectie, spans,
+                                          limiet, budget, basis)
+                if args.write_baseline:
+                    reporter.baseline(basis.data)
+                if limiet and limiet.reden:
+                    reporter.message(f"Stopped after {limiet.reden}")
+                reporter.total(totaal)
+            else:
+                reporter.message("Expected an .idp file")
+        except IDPZ3Error as e1:
+            res1 = e1.args[0].split(': ', 1)
+            res = res1[0].split()
+            line, col = int(res[3].strip(',')), int(res[5].strip(':'))
+            reporter.syntax_error(res[0], line, col, col, res1[1])
+        except TextXError as e:    # syntax of semantische fout in het programma
+            reporter.message(str(e))
+            message = str(e.args[0]) if e.args else str(e)
+            if e.line is not None and e.col is not None:
+                reporter.syntax_error("Error", e.line, e.col, e.col, message)
+            else:   # Bij een error zonder lijn nummer
+                reporter.syntax_error("Error", 0, 0, 10, message)
+        except Exception as e:      # fout in folint zelf (bv. een KeyError in een check)
+            reporter.limit("crash", "lint", f"crash: {type(e).__name__}: {e}")
+    return totaal
+
+def lint_file(file, args, reporter, lines=None, code=None):
+    """lint one file (only the blocks that overlap with `lines`, if given);
+    with `args.cache_dir` set, the result is looked up in (or added to) the
+    result cache
+
+    Args:
+        code (str, optional): source code of the file, e.g. from stdin;
+            read from `file` if None
+
+    Returns:
+        Tuple[int, bool]: the number of warnings/errors, and whether the
+            result came from the cache
+    """
+    cache, key = None, None
+    if args.cache_dir and (code is not None or file.endswith(".idp")):
+        from .cache import ResultCache
+        cache = ResultCache(args.cache_dir)
+        try:
+            if code is None:
+                with open(file, "r") as source:
+                    code = source.read()
+        except OSError:
+            cache = None    # de fout wordt door lint() gemeld
+    if cache:
+        options = {"extra": args.extra, "AST": args.AST, "lines": lines}
+        if args.fail_fast or args.max_findings is not None:
+            options.update(fail_fast=args.fail_fast, max_findings=args.max_findings)
+        if args.rules is not None:
+            options["rules"] = args.rules.key()
+        if args.budget_ms is not None:
+            options["budget_ms"] = args.budget_ms
+        if args.summary:
+            options["summary"] = True   # zonder locaties
+        if args.baseline:
+            from .baseline import load
+            baseline = load(args.baseline)   # het resultaat is gefilterd met de entry van deze file
+            options["baseline"] = [baseline.key(file), baseline.digest]
+        if args.write_baseline:
+            options["write_baseline"] = True    # met het baseline event
+        key = cache.key(code, options)
+        hit = cache.get(key)
+        if hit is not None:
+            replay(hit["events"], reporter)
+            return hit["aantal"], True
+        reporter = Recorder(forward=reporter)
+    aantal = lint(file, args, code, reporter=reporter, lines=lines)
+    if cache and not any(name == "incomplete" for name, _ in reporter.events):  #hangt af van de tijd
+        cache.put(key, {"events": reporter.events, "aantal": aantal})
+    return aantal, False
 
+def lint_worker(job):
+    """lint one file in a worker process
+
+    Returns:
+        Tuple[str, List, int, bool, List, float]: the file, the events of its
+            Recorder, its number of warnings/errors, whether the result came
+            from the cache, the profiled phases (None without --profile), and
+            the time it took
+    """
+    file, args, lines, code = job
+    profiler = profiling.Profiler() if args.profile else None
+    context.activate(context.RunContext(profiler, progress=progress))  # voor run_limited
+    load_parser()   # niet meetellen in de tijd van de eerste file
+    recorder = Recorder()
+    start = time.perf_counter()
+    aantal, cached = lint_file(file, args, recorder, lines, code)
+    elapsed = time.perf_counter() - start
+    profile = None
+    if profiler:
+        profile = [e.as_dict() for e in profiler.entries]
+    return file, recorder.events, aantal, cached, profile, elapsed
+
+def stopped(file, result):
+    """the result of lint_worker for a file whose worker was stopped (a Stopped result);
+    the file is not linted, so it has no findings and no total"""
+    events = [("limit", (result.kind, result.where(), result.message()))]
+    return file, events, 0, False, None, result.elapsed
+
+def load_parser():
+    """builds the idpparser metamodel, if not done yet in this process"""
+    from .ast_engine import Parse
+
+
+def merge(args):
+    """reports the results saved by the shards (`--merge`) as one run"""
+    from .shard import load_results, write_timings
+    nfiles, results = load_results(args.merge)
+    reporter = make_reporter(args)
+    reporter.begin(nfiles)
+    totaal = 0
+    for r in results:
+        reporter.file(r["file"])
+        replay(r["events"], reporter)
+        totaal += r["aantal"]
+    if len(results) < nfiles:
+        reporter.message(f"Missing the results of {nfiles - len(results)} of {nfiles} files")
+    reporter.end(totaal, skipped=args.rules.skipped if args.rules else None)
+    if args.timings:
+        write_timings(args.timings, {r["file"]: r["time"] for r in results if r["time"] is not None})
 
 def main():
     parser = argparse.ArgumentParser(description='SCA')
-    parser.add_argument('FILE', help='path to the .idp file', type=argparse.FileType('r'))
+    parser.add_argument('FILE', nargs='*',
+                        help='paths to .idp files, directories or glob patterns; - for stdin')
+    parser.add_argument('-j', '--jobs', help='number of worker processes (0 = one per cpu)',
+                        dest='jobs', type=int, default=1)
+    parser.add_argument('--block-jobs', help='number of workers that check the blocks of a file in parallel (0 = one per cpu)',
+                        dest='block_jobs', type=int, default=1)
+    parser.add_argument('--start-method', help='how the worker processes of -j are started: forkserver (default where available: forked from a server that loaded the parser once), fork or spawn',
+                        dest='start_method', choices=START_METHODS, default=None)
+    parser.add_argument('--timeout', help='stop linting a file after this many seconds (reported as timeout)',
+                        dest='timeout', metavar='SECONDS', type=float, default=None)
+    parser.add_argument('--max-memory', help='stop linting a file when its worker uses more than this many MB (reported as oom)',
+                        dest='max_memory', metavar='MB', type=int, default=None)
+    parser.add_argument('--fail-fast', help='stop checking a file at its first error',
+                        dest='fail_fast', action='store_true', default=False)
+    parser.add_argument('--max-findings', help='stop checking a file after N warnings and errors',
+                        dest='max_findings', metavar='N', type=int, default=None)
+    parser.add_argument('--budget-ms', help='check the cheapest rules first, and the others only while the time since the start of the file is below MS milliseconds; the checks that did not complete are reported',
+                        dest='budget_ms', metavar='MS', type=int, default=None)
+    parser.add_argument('--select', help='only check these rules: comma separated rule ids, patterns (style-*) or severities (error, warning)',
+                        dest='select', metavar='RULES', action='append', default=[])
+    parser.add_argument('--ignore', help='do not check these rules (like --select)',
+                        dest='ignore', metavar='RULES', action='append', default=[])
+    parser.add_argument('--config', help='the project configuration file with the rule selection (default: .folint in the current or a parent directory)',
+                        dest='config', metavar='FILE', default=None)
+    parser.add_argument('--profile-set', help='the rules to check by cost: fast (no checks that grow with the product of domain sizes, for editors) or full (default)',
+                        dest='profile_set', choices=["fast", "full"], default=None)
+    parser.add_argument('--write-baseline', help='save the findings of this run as the known findings, for --baseline',
+                        dest='write_baseline', metavar='FILE', default=None)
+    parser.add_argument('--baseline', help='only report the findings that are not in this baseline file; unchanged files and blocks are not checked',
+                        dest='baseline', metavar='FILE', default=None)
+    parser.add_argument('--format', help='output format (default text)',
+                        dest='format', choices=sorted(REPORTERS), default='text')
+    parser.add_argument('--summary', help='only print the number of warnings/errors per file, severity and rule (format text or jsonl)',
+                        dest='summary', action='store_true', default=False)
     parser.add_argument('--no-timing', help='don\'t display timing information',
                         dest='timing', action='store_false', default=True)
+    parser.add_argument('--profile', help='report wall/cpu time and node count per phase, on stderr',
+                        dest='profile', action='store_true', default=False)
+    parser.add_argument('--profile-format', help='format of the --profile report (default table)',
+                        dest='profile_format', choices=['table', 'json'], default='table')
+    parser.add_argument('--profile-output', help='write the --profile report to this file',
+                        dest='profile_output', default=None)
+    parser.add_argument('--changed-since', help='only lint the .idp files and blocks changed since this git ref',
+                        dest='changed_since', metavar='REF', default=None)
+    parser.add_argument('--shard', help='only lint shard i of n, e.g. 2/4; the shards have about the same cost',
+                        dest='shard', metavar='i/n', default=None)
+    parser.add_argument('--timings', help='JSON file with the time per file of earlier runs, used and updated by --shard',
+                        dest='timings', metavar='FILE', default=None)
+    parser.add_argument('--save-results', help='save the results in this JSON file, for --merge',
+                        dest='save_results', metavar='FILE', default=None)
+    parser.add_argument('--merge', help='report the results saved by the shards as one run',
+                        dest='merge', metavar='FILE', nargs='+', default=None)
+    parser.add_argument('--watch', help='lint the files again every time they change (stop with Ctrl-C)',
+                        dest='watch', action='store_true', default=False)
+    parser.add_argument('--watch-interval', help='seconds between two checks for changes (default 0.5)',
+                        dest='watch_interval', type=float, default=0.5)
+    parser.add_argument('--stdin-filename', help='name of the source code read from stdin (FILE -), in the output',
+                        dest='stdin_filename', default=None)
     parser.add_argument('--print-AST', help='gives the AST as output',
                         dest='AST', action='store_true', default=False)
     parser.add_argument('--Add-filename', help='Add filename to warning/error output',
                         dest='filename', action='store_true', default=False)
     parser.add_argument('--Add-extraStyle', help='Gives extra style guide warnings',
                         dest='extra', action='store_true', default=False)
+    parser.add_argument('--serve', help='run as a daemon, see folint.client',
+                        dest='serve', action='store_true', default=False)
+    parser.add_argument('--socket', help='path of the Unix socket of the daemon',
+                        dest='socket', default=None)
+    parser.add_argument('--cache', help='cache the results in the user cache directory',
+                        dest='cache', action='store_true', default=False)
+    parser.add_argument('--cache-dir', help='cache the results in this directory',
+                        dest='cache_dir', default=None)
+    parser.add_argument('--cache-size', help='maximum size of the cache in MB (default 64)',
+                        dest='cache_size', type=int, default=None)
+    parser.add_argument('--lsp', help='run as a Language Server Protocol server on stdio',
+                        dest='lsp', action='store_true', default=False)
     args = parser.parse_args()
+    if args.jobs < 0:
+        parser.error("--jobs must be 0 or more")
+    if args.start_method is not None:
+        import multiprocessing
+        if args.start_method not in multiprocessing.get_all_start_methods():
+            parser.error(f"--start-method {args.start_method} is not available on this platform")
+    if args.summary and args.format == "sarif":
+        parser.error("--summary prints a table (text) or JSON lines (jsonl)")
+    if args.write_baseline:
+        for option, given in (("--baseline", args.baseline), ("--fail-fast", args.fail_fast),
+                              ("--max-findings", args.max_findings is not None),
+                              ("--budget-ms", args.budget_ms is not None),
+                              ("--changed-since", args.changed_since), ("--shard", args.shard),
+                              ("--watch", args.watch), ("--merge", args.merge)):
+            if given:
+                parser.error(f"--write-baseline needs all findings of all files, not with {option}")
+    if args.baseline:
+        from .baseline import load
+        try:
+            load(args.baseline)
+        except (OSError, ValueError) as e:
+            parser.error(f"--baseline: {e}")
+    if args.timings:
+        from .shard import read_timings
+        try:
+            read_timings(args.timings)  # de shards en --merge lezen de file later opnieuw
+        except (OSError, ValueError) as e:
+            parser.error(f"--timings: {e}")
+    if args.max_findings is not None and args.max_findings <= 0:
+        parser.error("--max-findings must be more than 0")
+    if args.budget_ms is not None and args.budget_ms <= 0:
+        parser.error("--budget-ms must be more than 0")
+    if args.timeout is not None and args.timeout <= 0:
+        parser.error("--timeout must be more than 0")
+    if args.max_memory is not None and args.max_memory <= 0:
+        parser.error("--max-memory must be more than 0")
+    limits = args.timeout is not None or args.max_memory is not None
+    from .rules import selection, selectors
+    try:
+        args.rules = selection(selectors(args.select) or None, selectors(args.ignore), args.config,
+                               profile=args.profile_set)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if args.block_jobs == 0:
+        import os
+        args.block_jobs = os.cpu_count() or 1
+    if args.serve:
+        from .client import DEFAULT_SOCKET
+        from .daemon import serve
+        serve(args.socket or DEFAULT_SOCKET)
+        return
+    if args.lsp:
+        from .lsp import serve
+        serve()
+        return
+    if args.merge:
+        try:
+            merge(args)
+        except (OSError, ValueError) as e:
+            parser.error(f"--merge: {e}")
+        return
+    if not args.FILE and not args.changed_since:
+        parser.error("the following arguments are required: FILE")
+    if args.cache and not args.cache_dir:
+        from .cache import DEFAULT_DIR
+        args.cache_dir = DEFAULT_DIR
+    if args.watch:
+        from .watch import watch
+        watch(args, args.watch_interval)
+        return
 
     start_time = time.time()
-    try:
-        global filename
-        global argfilename
-        totaal = 0
-        filename = sys.argv[1]
-        argfilename = args.filename
-        if sys.argv[1].endswith(".idp"):
-            idp = IDP.from_file(sys.argv[1])    # parse idp file to AST
-            if args.AST:
-                idp.printAST(0)                 # print AST van file
-            totaal += sca(idp)                            # Voer SCA uit
-            if args.extra:
-                totaal += extra(filename)                 # Extra style guide checking
-            print(f"\n---------- Totaal aantal fouten {totaal} ----------")
-        else:
-            print("Expected an .idp file")
-    except IDPZ3Error as e1:
-        res1 = e1.args[0].split(': ', 1)
-        res = res1[0].split()
-        print("\n---------- Syntax Error ----------")
-        if args.filename :
-            print(f"{filename}: {res[0]}: line {res[3].strip(',')} - colStart {res[5].strip(':')} - colEnd {res[5].strip(':')} => {res1[1]}")
-        else:
-            print(f"{res[0]}: line {res[3].strip(',')} - colStart {res[5].strip(':')} - colEnd {res[5].strip(':')} => {res1[1]}")
-    except KeyError as e2: # Bij een KeyError
-        if args.filename :
-            print(f"{filename}: Error: line {0} - colStart {0} - colEnd {0} => Key Error {e2}")
-        else :
-            print(f"Error: line {0} - colStart {0} - colEnd {0} => Key Error {e2}")
-    except Exception as e:
-        print(e)
-        print("\n---------- Syntax Error ----------")
+    niet_gevonden = missing(args.FILE)
+    if niet_gevonden:
+        parser.error(f"no such file, directory or match: {', '.join(niet_gevonden)}")
+    files = expand_paths(args.FILE or ["."])
+    lines = {}      # de gewijzigde lijnen, per file
+    if args.changed_since:
+        import os
+        from .changes import changed_lines, GitError
         try:
-            if args.filename :
-                print(f"{filename}: Error: line {e.line} - colStart {e.col} - colEnd {e.col} => {e.args}")
-            else :
-                print(f"Error: line {e.line} - colStart {e.col} - colEnd {e.col} => {e.args}")
-        except: # Bij een error zonder lijn nummer
-            if args.filename :
-                print(f"{filename}: Error: line {0} - colStart {0} - colEnd {10} => {e}")
-            else :
-                print(f"Error: line {0} - colStart {0} - colEnd {10} => {e}")
-
-    if args.timing:
+            changes = changed_lines(args.changed_since)
+        except GitError as e:
+            parser.error(f"--changed-since: {e}")
+        files = [f for f in files if os.path.realpath(f) in changes]
+        lines = {f: changes[os.path.realpath(f)] for f in files}
+    sources = {}    # de broncode die niet uit een file komt
+    if "-" in files:
+        label = args.stdin_filename or STDIN
+        sources[label] = sys.stdin.read()
+        files = [label if f == "-" else f for f in files]
+    indices = list(range(len(files)))     # de files van deze run (of shard)
+    shard = None
+    if args.shard:
+        from .shard import parse_shard, costs, partition, read_timings
+        try:
+            shard = i, n = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(f"--shard: {e}")
+        timings = read_timings(args.timings) if args.timings else None
+        indices = partition(files, n, costs(files, timings))[i - 1]
+    reporter = make_reporter(args)
+    reporter.begin(len(indices))
+    profiler = profiling.Profiler() if args.profile else None
+    context.activate(context.RunContext(profiler))
+    totaal, hits = 0, 0
+    results = []    # per file, voor --save-results en --timings (de events enkel voor --save-results)
+    record = args.save_results or args.timings
+    if args.jobs == 1 and not limits:
+        # in dit proces: de resultaten worden getoond zodra een blok gecontroleerd is
+        if (profiler or record) and indices:
+            load_parser()
+        def gelint():
+            for index in indices:
+                file = files[index]
+                reporter.file(file)
+                recorder = Recorder(forward=reporter) if args.save_results or args.write_baseline else reporter
+                start = time.perf_counter()
+                aantal, cached = lint_file(file, args, recorder, lines.get(file), sources.get(file))
+                yield index, file, getattr(recorder, "events", None), aantal, cached, time.perf_counter() - start
+    else:
+        # in worker processen; met --timeout/--max-memory worden die gestopt en vervangen.
+        # De resultaten komen in de volgorde van de files, elk zodra de vorige er zijn
+        # (met een begrensde buffer, zie batch.py), en worden meteen gemeld
+        def gelint():
+            jobs = [(files[i], args, lines.get(files[i]), sources.get(files[i])) for i in indices]
+            method = args.start_method or default_method()
+            if limits:
+                max_memory = args.max_memory and args.max_memory * 2**20
+                gedaan = (stopped(job[0], r) if isinstance(r, Stopped) else r
+                          for job, r in zip(jobs, run_limited(lint_worker, jobs, args.jobs,
+                                                              args.timeout, max_memory,
+                                                              method, PRELOAD)))
+            else:
+                gedaan = run_batch(lint_worker, jobs, args.jobs, method, PRELOAD)
+            for index, (file, events, aantal, cached, profile, elapsed) in zip(indices, gedaan):
+                reporter.file(file)
+                replay(events, reporter)
+                if profiler and profile:
+                    profiler.extend(profile)
+                yield index, file, events, aantal, cached, elapsed
+    if args.write_baseline:
+        from .baseline import Baseline
+        baseline = Baseline(args.write_baseline, rules=args.rules.key() if args.rules else None)
+    for index, file, events, aantal, cached, elapsed in gelint():
+        totaal += aantal
+        hits += cached
+        if args.write_baseline:
+            baseline.add(file, events)
+        if record:
+            results.append({"index": index, "file": file, "aantal": aantal,
+                            "events": events if args.save_results else None,
+                            "time": None if cached else elapsed})
+    if not files:
+        reporter.message("No changed .idp files" if args.changed_since else "Expected an .idp file")
+    cache = None
+    if args.cache_dir:
+        from .cache import ResultCache, DEFAULT_SIZE
+        ResultCache(args.cache_dir, args.cache_size or DEFAULT_SIZE).evict()
+        cache = (hits, len(indices) - hits)
+    reporter.end(totaal, cache, args.rules.skipped if args.rules else None)
+    if args.write_baseline:
+        baseline.save(args.write_baseline)
+    if args.save_results:
+        from .shard import save_results
+        save_results(args.save_results, shard, len(files), results)
+    if args.timings and not args.shard:     # alle shards moeten dezelfde timings gebruiken
+        from .shard import write_timings
+        write_timings(args.timings, {r["file"]: r["time"] for r in results if r["time"] is not None})
+
+    if args.timing and args.format == "text":
         print(f"\nElapsed time: {format(time.time() - start_time)} seconds")
+    if profiler:
+        report = profiler.as_json() if args.profile_format == "json" else profiler.table()
+        if args.profile_output:
+            with open(args.profile_output, "w") as f:
+                f.write(report + "\n")
+        else:
+            print(report, file=sys.stderr)
 
 if __name__ == "__main__":
     main()
@@ -1 +1,13 @@
 # __init__.py
+
+__version__ = "0.0.1"
+
+__all__ = ["Finding", "lint_source"]
+
+
+def __getattr__(name):
+    # lazy: de client en `folint --help` importeren dit package ook
+    if name in __all__:
+        from . import api
+        return getattr(api, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
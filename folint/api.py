@@ -0,0 +1,97 @@
+# api.py
+"""
+    Linting from Python, without the command line
+
+        >>> from folint import lint_source
+        >>> for f in lint_source(code, rules=["unused-variable", "error"]):
+        ...     print(f.line, f.column, f.rule, f.message)
+
+    Nothing is printed or written; the findings are returned as Finding
+    objects.  The rule ids are those of folint.rules.RULES; the rules that
+    are not selected are not checked.  The project configuration (.folint)
+    is not used.
+"""
+
+from argparse import Namespace
+from typing import NamedTuple, Optional
+
+from .report import Reporter
+
+
+class Finding(NamedTuple):
+    """a warning or error of folint (line and columns start at 1)"""
+    severity: str               # "Error" or "Warning"
+    message: str
+    line: int
+    column: int
+    end_column: int
+    rule: str                   # id in folint.rules.RULES
+    file: Optional[str] = None
+    block: Optional[str] = None  # None for the extra style check and syntax errors
+
+
+class Collector(Reporter):
+    """a Reporter that keeps the findings as Finding objects"""
+
+    def __init__(self, filename=None):
+        super().__init__()
+        self.filename = filename
+        self.found = []
+
+    def file(self, filename):
+        pass    # de naam van lint_source blijft
+
+    def findings(self, soort, lijst):
+        for line, colStart, colEnd, message, rule in lijst:
+            self.found.append(Finding(soort, message, line, colStart, colEnd, rule,
+                                      self.filename, self.block_name))
+
+    def extra(self, lijst):
+        for line, colStart, colEnd, message, soort, rule in lijst:  # kolommen van extra_check starten bij 0
+            self.found.append(Finding(soort, message, line, colStart + 1, colEnd + 1, rule,
+                                      self.filename))
+
+    def error(self, soort, line, colStart, colEnd, message):
+        self.found.append(Finding(soort, message, line, colStart, colEnd, "crash", self.filename))
+
+    def syntax_error(self, soort, line, colStart, colEnd, message):
+        self.found.append(Finding(soort, message, line, colStart, colEnd, "syntax-error",
+                                  self.filename))
+
+    def limit(self, kind, fase, message):
+        self.found.append(Finding("Error", message, 0, 0, 0, kind, self.filename))
+
+
+def lint_source(code, *, rules=None, profile=None, filename=None, extra=False, fail_fast=False,
+                max_findings=None):
+    """lints the FO(.) source `code`
+
+    Args:
+        code (str): the source code of an .idp file
+        rules (Iterable[str], optional): only check these rules: rule ids,
+            patterns (style-*) or severities (error, warning); all by default
+            (None), none for an empty list
+        profile (str, optional): "fast" skips the rules whose cost grows with
+            the product of domain sizes (--profile-set); "full" by default
+        filename (str, optional): the file of the findings; only a label,
+            the file is not read
+        extra (bool): also do the extra style guide check (--Add-extraStyle)
+        fail_fast (bool): stop at the first error (--fail-fast)
+        max_findings (int, optional): stop after this many findings (--max-findings)
+
+    Returns:
+        List[Finding]: the findings, in the order of the command line output
+
+    Raises:
+        ValueError: an unknown rule in `rules`, or an unknown profile
+    """
+    from .rules import selection
+    from .SCA import STDIN, lint
+    if rules is not None or profile is not None:
+        rules = selection(None if rules is None else list(rules), project=False, profile=profile)
+    collector = Collector(filename)
+    args = Namespace(AST=False, extra=extra, filename=False, block_jobs=1,
+                     fail_fast=fail_fast, max_findings=max_findings, rules=rules, budget_ms=None,
+                     summary=False, baseline=None, write_baseline=None)
+    lint(STDIN, args, code, reporter=collector)
+    return collector.found
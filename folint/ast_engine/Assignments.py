@@ -26,7 +26,6 @@ __all__ = ["Status", "Assignment", "Assignments"]
 from copy import copy
 from enum import Enum, auto
 from typing import Dict, Optional, Tuple
-from z3 import BoolRef
 
 from .Expression import Expression, TRUE, FALSE, NOT, EQUALS, AppliedSymbol
 from .utils import NEWL, BOOL
@@ -160,7 +159,7 @@ class Assignment(object):
         value = FALSE if self.value.same_as(TRUE) else TRUE
         return Assignment(self.sentence, value, self.status, self.relevant)
 
-    def translate(self, problem: "Theory") -> BoolRef:
+    def translate(self, problem: "Theory") -> "BoolRef":
         return self.formula().translate(problem)
 
     def as_set_condition(self
@@ -824,31 +824,31 @@ class AQuantification(Expression):
         for q in self.quantees: #get all variable in quantification
             for q2 in q.vars:
                 vars.add(q2[0].str)
-        if self.f.variables != vars: # unused variables, te veel variable in quantee, als te weining var wordt parse error ergens anders opgevangen
+        if fouten.aan("unused-variable") and self.f.variables != vars: # unused variables, te veel variable in quantee, als te weining var wordt parse error ergens anders opgevangen
             set3 = vars - self.f.variables
             while len(set3) > 0:      #alle variable in quantification die niet gebruikt worden zoeken
                 a = set3.pop()
                 for q in self.quantees:
                     for q2 in q.vars:
                         if q2[0].str == a:
-                            fouten.append((q2[0],f"Unused variable {q2[0].str}","Warning"))
+                            fouten.append((q2[0],f"Unused variable {q2[0].str}","Warning","unused-variable"))
                             break
 
-        if self.q == '∀': #if universele quantor
+        if self.q == '∀' and fouten.aan("universal-conjunction"): #if universele quantor
             if (isinstance(self.f, AConjunction) or isinstance(self.f,Brackets) and isinstance(self.f.f,AConjunction)):
-                fouten.append((self.f,f"Common mistake, use an implication after a universal quantor instead of a conjuction ","Warning"))
-        if self.q == '∃': #if existentiele quantor
+                fouten.append((self.f,f"Common mistake, use an implication after a universal quantor instead of a conjuction ","Warning","universal-conjunction"))
+        if self.q == '∃' and fouten.aan("existential-implication"): #if existentiele quantor
             if (isinstance(self.f, AImplication) or isinstance(self.f,Brackets) and isinstance(self.f.f,AImplication)):
-                fouten.append((self.f,f"Common mistake, use a conjuction after an existential quantor instead of an implication ","Warning"))
-        if isinstance(self.f, AEquivalence): # check if variable only occurring on one side of an equivalence
+                fouten.append((self.f,f"Common mistake, use a conjuction after an existential quantor instead of an implication ","Warning","existential-implication"))
+        if isinstance(self.f, AEquivalence) and fouten.aan("equivalence-variable"): # check if variable only occurring on one side of an equivalence
             links = self.f.sub_exprs[0]
             rechts = self.f.sub_exprs[1]
             if links.variables != vars:   #check if all vars in linkerdeel van AEquivalence
                 set3 = vars - links.variables
-                fouten.append((self.f,f"Common mistake, variable {set3.pop()} only occuring on one side of equivalence","Warning"))
+                fouten.append((self.f,f"Common mistake, variable {set3.pop()} only occuring on one side of equivalence","Warning","equivalence-variable"))
             elif rechts.variables != vars:    #check if all vars in rechterdeel van AEquivalence
                 set3 = vars - links.variables
-                fouten.append((self.f,f"Common mistake, variable {set3.pop()} only occuring on one side of equivalence","Warning"))
+                fouten.append((self.f,f"Common mistake, variable {set3.pop()} only occuring on one side of equivalence","Warning","equivalence-variable"))
 
         for sub in self.sub_exprs:
             sub.SCA_Check(fouten)
@@ -1000,24 +1000,25 @@ class AComparison(Operator):
             (3) Niet dezelfde types en mogen NIET vergeleken worden maar kunnen toch vergeleken worden (warning)
             (4) Niet dezelfde types en mogen NIET vergeleken worden en kunnen NIET vergeleken worden (error)
         """
-        type1 = self.sub_exprs[0].getType() #get type van linker lid
-        type2 = self.sub_exprs[1].getType() #get type van rechter lid
-        type1 = typeSymbol_to_String(type1)  #type symbool omzetten naar string
-        type2 = typeSymbol_to_String(type2)  #type symbool omzetten naar string
-
-        if type1 != type2:   #comparison van 2 verschillende types, categorieen (2),(3) en (4)
-            if type1 is None:     #type linkerlid niet kunnen bepalen
-                fouten.append((self.sub_exprs[0],f"Could not determine the type of {self.sub_exprs[0]} ","Warning"))
-            elif type2 is None:   #type rechterlid niet kunnen bepalen
-                fouten.append((self.sub_exprs[1],f"Could not determine the type of {self.sub_exprs[1]} ","Warning"))
-            else:                   #zowel linker- als rechterlid type zijn bepaald maar toch verschillend
-                cat = typesVergelijken(type1,type2) #kijk welke types met elkaar vergeleken mogen worden
-                if cat == 3:  #cat(3) WARNING
-                    fouten.append((self,f"Comparison of 2 diffent types: {type1} and {type2}","Warning"))
-                if cat == 4:  #cat(4) ERROR
-                    fouten.append((self,f"Comparison of 2 diffent types: {type1} and {type2}","Error"))
-        if (type1 is None and type2 is None):   #beide types zijn unknown
-            fouten.append((self.sub_exprs[0],f"Comparison of 2 unknown types: {type1} and {type2}","Warning"))
+        if fouten.aan("comparison-type") or fouten.aan("unknown-type"):
+            type1 = self.sub_exprs[0].getType() #get type van linker lid
+            type2 = self.sub_exprs[1].getType() #get type van rechter lid
+            type1 = typeSymbol_to_String(type1)  #type symbool omzetten naar string
+            type2 = typeSymbol_to_String(type2)  #type symbool omzetten naar string
+
+            if type1 != type2:   #comparison van 2 verschillende types, categorieen (2),(3) en (4)
+                if type1 is None:     #type linkerlid niet kunnen bepalen
+                    fouten.append((self.sub_exprs[0],f"Could not determine the type of {self.sub_exprs[0]} ","Warning","unknown-type"))
+                elif type2 is None:   #type rechterlid niet kunnen bepalen
+                    fouten.append((self.sub_exprs[1],f"Could not determine the type of {self.sub_exprs[1]} ","Warning","unknown-type"))
+                else:                   #zowel linker- als rechterlid type zijn bepaald maar toch verschillend
+                    cat = typesVergelijken(type1,type2) #kijk welke types met elkaar vergeleken mogen worden
+                    if cat == 3:  #cat(3) WARNING
+                        fouten.append((self,f"Comparison of 2 diffent types: {type1} and {type2}","Warning","comparison-type"))
+                    if cat == 4:  #cat(4) ERROR
+                        fouten.append((self,f"Comparison of 2 diffent types: {type1} and {type2}","Error","comparison-type"))
+            if (type1 is None and type2 is None):   #beide types zijn unknown
+                fouten.append((self.sub_exprs[0],f"Comparison of 2 unknown types: {type1} and {type2}","Warning","unknown-type"))
 
         #SCA check voor kind nodes
         for sub in self.sub_exprs:
@@ -1030,24 +1031,25 @@ class ASumMinus(Operator):
     PRECEDENCE = 90
 
     def SCA_Check(self, fouten):
-        for i in range(0,len(self.sub_exprs)):
-            if (self.sub_exprs[i].getType()=="𝔹" and self.sub_exprs[i-1].getType()=="𝔹"):   #optelling of aftrekking van booleans met elkaar
-                fouten.append((self,f"Sum or difference of two elements of type Bool","Error"))
-                break
-
-            lijst = ["Int","Real","Bool"]
-            if not(typeSymbol_to_String(self.sub_exprs[i-1].getType()) in lijst):
-                fouten.append((self,f"Wrong type '{typeSymbol_to_String(self.sub_exprs[i-1].getType())}' used in sum or difference ","Error"))
-
-            if self.sub_exprs[i].getType() != self.sub_exprs[0].getType():        #optelling of aftrekking van elementen van verschillende types
-                type1 = typeSymbol_to_String(self.sub_exprs[i-1].getType())
-                type2 = typeSymbol_to_String(self.sub_exprs[i].getType())
-                if ((type1=="Int" and type2=="Real") or (type1=="Real" and type2=="Int")):      #types Int en Real mogen met elkaar opgeteld of afgetrokken worden
-                    continue
-                else:
-                    fouten.append((self,f"Sum or difference of elements with possible incompatible types: {type1} and {type2}","Warning"))
+        if fouten.aan("sum-type"):
+            for i in range(0,len(self.sub_exprs)):
+                if (self.sub_exprs[i].getType()=="𝔹" and self.sub_exprs[i-1].getType()=="𝔹"):   #optelling of aftrekking van booleans met elkaar
+                    fouten.append((self,f"Sum or difference of two elements of type Bool","Error","sum-type"))
                     break
 
+                lijst = ["Int","Real","Bool"]
+                if not(typeSymbol_to_String(self.sub_exprs[i-1].getType()) in lijst):
+                    fouten.append((self,f"Wrong type '{typeSymbol_to_String(self.sub_exprs[i-1].getType())}' used in sum or difference ","Error","sum-type"))
+
+                if self.sub_exprs[i].getType() != self.sub_exprs[0].getType():        #optelling of aftrekking van elementen van verschillende types
+                    type1 = typeSymbol_to_String(self.sub_exprs[i-1].getType())
+                    type2 = typeSymbol_to_String(self.sub_exprs[i].getType())
+                    if ((type1=="Int" and type2=="Real") or (type1=="Real" and type2=="Int")):      #types Int en Real mogen met elkaar opgeteld of afgetrokken worden
+                        continue
+                    else:
+                        fouten.append((self,f"Sum or difference of elements with possible incompatible types: {type1} and {type2}","Warning","sum-type"))
+                        break
+
         return super().SCA_Check(fouten)
 
     def getType(self):
@@ -1071,22 +1073,23 @@ class AMultDiv(Operator):
     PRECEDENCE = 100
 
     def SCA_Check(self, fouten):
-        for i in range(0,len(self.sub_exprs)):
-            # multi/div of 2 "Bool" is not possible (error)
-            if (self.sub_exprs[i].getType()=="𝔹" and self.sub_exprs[i-1].getType()=="𝔹"):
-                fouten.append((self,f"Multiplication or division of two elements of type Bool","Error"))
-            lijst = ["Int","Real","Bool"]
-            # multi/div only possible with "Int","Real" and "Bool"
-            if not(typeSymbol_to_String(self.sub_exprs[i-1].getType()) in lijst):
-                fouten.append((self.sub_exprs[i-1],f"Wrong type '{typeSymbol_to_String(self.sub_exprs[i-1].getType())}' used in multiplication or divison ","Error"))
-            if self.sub_exprs[i].getType() != self.sub_exprs[0].getType():        #vermenigvuldigen of delen van elementen van verschillende types
-                type1 = typeSymbol_to_String(self.sub_exprs[i-1].getType())
-                type2 = typeSymbol_to_String(self.sub_exprs[i].getType())
-                if ((type1=="Int" and type2=="Real") or (type1=="Real" and type2=="Int")):      #vermenigvuldigen of delen tss met int en Real mag
-                    continue
-                else:
-                    fouten.append((self,f"Multiplication or division of elements with possible incompatible types: {type1} and {type2}","Warning"))
-                    break
+        if fouten.aan("product-type"):
+            for i in range(0,len(self.sub_exprs)):
+                # multi/div of 2 "Bool" is not possible (error)
+                if (self.sub_exprs[i].getType()=="𝔹" and self.sub_exprs[i-1].getType()=="𝔹"):
+                    fouten.append((self,f"Multiplication or division of two elements of type Bool","Error","product-type"))
+                lijst = ["Int","Real","Bool"]
+                # multi/div only possible with "Int","Real" and "Bool"
+                if not(typeSymbol_to_String(self.sub_exprs[i-1].getType()) in lijst):
+                    fouten.append((self.sub_exprs[i-1],f"Wrong type '{typeSymbol_to_String(self.sub_exprs[i-1].getType())}' used in multiplication or divison ","Error","product-type"))
+                if self.sub_exprs[i].getType() != self.sub_exprs[0].getType():        #vermenigvuldigen of delen van elementen van verschillende types
+                    type1 = typeSymbol_to_String(self.sub_exprs[i-1].getType())
+                    type2 = typeSymbol_to_String(self.sub_exprs[i].getType())
+                    if ((type1=="Int" and type2=="Real") or (type1=="Real" and type2=="Int")):      #vermenigvuldigen of delen tss met int en Real mag
+                        continue
+                    else:
+                        fouten.append((self,f"Multiplication or division of elements with possible incompatible types: {type1} and {type2}","Warning","product-type"))
+                        break
         return super().SCA_Check(fouten)
 
     def getType(self):
@@ -1147,9 +1150,9 @@ class AUnary(Expression):
 
     def SCA_Check(self,fouten):
         # style regel: Gebruik van haakjes bij een negated in-statement
-        if (isinstance(self.f, AppliedSymbol) and self.f.is_enumeration=='in'):
+        if (fouten.aan("negated-in-brackets") and isinstance(self.f, AppliedSymbol) and self.f.is_enumeration=='in'):
             if hasattr(self,"parent"):
-                fouten.append((self,f"Style guide check, place brackets around negated in-statement ","Warning"))
+                fouten.append((self,f"Style guide check, place brackets around negated in-statement ","Warning","negated-in-brackets"))
 
         for sub in self.sub_exprs:
             sub.SCA_Check(fouten)
@@ -1381,29 +1384,31 @@ class AppliedSymbol(Expression):
     def SCA_Check(self,fouten):
         #check op juiste aantal argumenten
         if self.decl.arity != len(self.sub_exprs):
-            if self.code != str(self.original):
+            if not fouten.aan("arity"):
+                pass
+            elif self.code != str(self.original):
                 if abs(self.decl.arity - len(self.sub_exprs))!=1: #voor rules in definities
-                    fouten.append((self,f"Wrong number of arguments: given {len(self.sub_exprs)} but expected {self.decl.arity}","Error"))
+                    fouten.append((self,f"Wrong number of arguments: given {len(self.sub_exprs)} but expected {self.decl.arity}","Error","arity"))
             else:
-                fouten.append((self,f"Wrong number of arguments: given {len(self.sub_exprs)} but expected {self.decl.arity}","Error"))
-        else :
+                fouten.append((self,f"Wrong number of arguments: given {len(self.sub_exprs)} but expected {self.decl.arity}","Error","arity"))
+        elif fouten.aan("argument-type"):
             #check als argumenten van het juiste type zijn
             for i in range(self.decl.arity):
                 if self.decl.sorts[i].type != self.sub_exprs[i].getType():
                     if self.sub_exprs[i].getType() is None:
                         if isinstance(self.sub_exprs[i],(ASumMinus, AMultDiv)):
-                            fouten.append((self,f"Argument of Unknown type, type of {self.sub_exprs[i]} is unknown (formule with different types)","Warning"))
+                            fouten.append((self,f"Argument of Unknown type, type of {self.sub_exprs[i]} is unknown (formule with different types)","Warning","argument-type"))
                         else:
-                            fouten.append((self,f"Argument of Unknown type, type of {self.sub_exprs[i]} is unknown (probably untyped quantifier)","Warning"))
+                            fouten.append((self,f"Argument of Unknown type, type of {self.sub_exprs[i]} is unknown (probably untyped quantifier)","Warning","argument-type"))
                     else :
-                        fouten.append((self,f"Argument of wrong type : expected type= {typeSymbol_to_String(self.decl.sorts[i].type)} but given type= {typeSymbol_to_String(self.sub_exprs[i].getType())}","Error"))
+                        fouten.append((self,f"Argument of wrong type : expected type= {typeSymbol_to_String(self.decl.sorts[i].type)} but given type= {typeSymbol_to_String(self.sub_exprs[i].getType())}","Error","argument-type"))
                     break #so only 1 error message
 
         # check if elementen in enumeratie are of correct type, vb Lijn() in {Belgie}. expected type Kleur, Belgie is of type Land
-        if self.is_enumeration =='in':
+        if self.is_enumeration =='in' and fouten.aan("element-type"):
             for i in self.in_enumeration.tuples :
                 if self.decl.type != i.args[0].getType():
-                    fouten.append((i.args[0],f"Element of wrong type : expected type= {typeSymbol_to_String(self.decl.type)} but given type= {typeSymbol_to_String(i.args[0].getType())}","Error"))
+                    fouten.append((i.args[0],f"Element of wrong type : expected type= {typeSymbol_to_String(self.decl.type)} but given type= {typeSymbol_to_String(i.args[0].getType())}","Error","element-type"))
                     break
 
         for sub in self.sub_exprs:
@@ -1591,8 +1596,8 @@ class Brackets(Expression):
 
     def SCA_Check(self, fouten):
         # style regel: Vermijd onnodige haakje
-        if isinstance(self.f,Brackets):
-            fouten.append((self,f"Style guide, redundant brackets","Warning"))
+        if isinstance(self.f,Brackets) and fouten.aan("redundant-brackets"):
+            fouten.append((self,f"Style guide, redundant brackets","Warning","redundant-brackets"))
         return super().SCA_Check(fouten)
 
     def getType(self):
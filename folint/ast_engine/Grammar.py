@@ -0,0 +1,174 @@
+"""
+
+Ahead-of-time compiled FO(·) grammar.
+
+Building the idpparser metamodel is dominated by parsing Idp.tx with the
+grammar of textX itself.  The build of the package (setup.py build_py), or
+`python -m folint.ast_engine.Grammar` in a source checkout, stores the
+resulting parse tree next to Idp.tx; `load_metamodel` builds the
+metamodel from that tree, skipping the grammar parse.  The stored tree is
+only used if its key (hash of Idp.tx, textX and Arpeggio versions) still
+matches.  Otherwise the metamodel is built from Idp.tx, and the tree is
+stored in the user cache directory (CACHE_DIR), never in the installed
+package.
+
+"""
+__all__ = ["load_metamodel", "compile_grammar"]
+
+import hashlib
+import pickle
+from os import environ, getpid, makedirs, path, replace
+
+import arpeggio
+import textx
+from arpeggio import EndOfFile, NonTerminal, ParserPython, Terminal, visit_parse_tree
+from textx import metamodel_from_file
+from textx.lang import TextXVisitor, comment, textx_model, textX_parsers
+from textx.metamodel import TextXMetaModel
+
+
+class _Match(object):
+    """stands in for the re.Match of a RegExMatch terminal"""
+    def __init__(self, groups):
+        self.groups = groups
+
+    def group(self, i=0):
+        return self.groups[i]
+
+
+CACHE_DIR = path.join(environ.get("XDG_CACHE_HOME") or path.expanduser("~/.cache"),
+                      "folint-grammar")     # niet in de result cache: die wordt opgeruimd
+
+
+def artifact(file: str) -> str:
+    """path of the compiled grammar of `file`, next to it (made by the build)"""
+    return file + ".pickle"
+
+
+def cached_artifact(code: str) -> str:
+    """path of the compiled grammar `code` in the user cache directory"""
+    return path.join(CACHE_DIR, f"grammar-{grammar_key(code)[:16]}.pickle")
+
+
+def grammar_key(code: str) -> str:
+    h = hashlib.sha256()
+    for part in (code, textx.__version__, arpeggio.__version__):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _meta_parser(metamodel):
+    """the textX parser for textX grammars, as created by textx.lang.language_from_str"""
+    if metamodel.debug not in textX_parsers:
+        textX_parsers[metamodel.debug] = ParserPython(
+            textx_model, comment_def=comment, ignore_case=False,
+            reduce_tree=False, memoization=metamodel.memoization,
+            debug=metamodel.debug, file=metamodel.file)
+    return textX_parsers[metamodel.debug]
+
+
+def _rules(parser):
+    """all parsing expressions of `parser`, in a fixed order"""
+    out, seen = [], set()
+    todo = [parser.comments_model, parser.parser_model]
+    while todo:
+        rule = todo.pop()
+        if rule is None or id(rule) in seen:
+            continue
+        seen.add(id(rule))
+        out.append(rule)
+        todo.extend(reversed(rule.nodes))
+    return out
+
+
+def _dump(node, index):
+    rule = "EOF" if isinstance(node.rule, EndOfFile) else index[id(node.rule)]
+    if isinstance(node, Terminal):
+        groups = None
+        if node.extra_info is not None:
+            groups = (node.extra_info.group(0),) + node.extra_info.groups()
+        return (rule, node.position, node.value, node.suppress, groups)
+    return (rule, node.position, [_dump(n, index) for n in node])
+
+
+def _load(data, rules):
+    if len(data) == 5:
+        rule, position, value, suppress, groups = data
+        rule = EndOfFile() if rule == "EOF" else rules[rule]
+        return Terminal(rule, position, value, suppress=suppress,
+                        extra_info=None if groups is None else _Match(groups))
+    rule, position, nodes = data
+    out = NonTerminal(rules[rule], [_load(n, rules) for n in nodes])
+    out.position = position
+    return out
+
+
+def compile_grammar(file: str, out: str = None) -> str:
+    """parses the textX grammar in `file` and stores its parse tree
+
+    Args:
+        file (str): path to the .tx file
+        out (str, optional): where to store it; next to `file` if None
+
+    Returns:
+        str: the path of the compiled grammar
+    """
+    with open(file, encoding="utf-8") as f:
+        code = f.read()
+    parser = _meta_parser(TextXMetaModel(file_name=file))
+    tree = parser.parse(code, file)
+    index = {id(r): i for i, r in enumerate(_rules(parser))}
+    out = out or artifact(file)
+    data = {"key": grammar_key(code), "tree": _dump(tree, index)}
+    temp = f"{out}.{getpid()}.tmp"
+    with open(temp, "wb") as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    replace(temp, out)
+    return out
+
+
+def _from_tree(file, code, tree, **kwargs):
+    """builds the metamodel as textx.metamodel_from_file, from the stored parse tree"""
+    metamodel = TextXMetaModel(file_name=file, **kwargs)
+    parser = _meta_parser(metamodel)
+    parser.input, parser.file_name, parser.line_ends = code, file, []
+    lang_parser = visit_parse_tree(_load(tree, _rules(parser)),
+                                   TextXVisitor(parser, metamodel))
+    metamodel.validate()
+    lang_parser.metamodel = metamodel
+    metamodel._parser_blueprint = lang_parser
+    metamodel.validate_user_classes()
+    return metamodel
+
+
+def load_metamodel(file: str, **kwargs):
+    """returns the metamodel of the textX grammar in `file`,
+    using its compiled grammar when it is up to date
+
+    Args:
+        file (str): path to the .tx file
+        kwargs: the arguments of textx.metamodel_from_file
+    """
+    with open(file, encoding="utf-8") as f:
+        code = f.read()
+    cached = cached_artifact(code)
+    for compiled_file in (artifact(file), cached):
+        try:
+            with open(compiled_file, "rb") as f:
+                compiled = pickle.load(f)
+            if compiled["key"] == grammar_key(code):
+                return _from_tree(file, code, compiled["tree"], **kwargs)
+        except Exception:
+            pass    # ontbrekend, verouderd of onleesbaar
+    metamodel = metamodel_from_file(file, **kwargs)
+    try:
+        makedirs(CACHE_DIR, exist_ok=True)
+        compile_grammar(file, cached)   # voor de volgende keer
+    except Exception:
+        pass    # bv. geen schrijfbare home directory
+    return metamodel
+
+
+if __name__ == "__main__":
+    print(compile_grammar(path.join(path.dirname(__file__), 'Idp.tx')))
@@ -34,12 +34,14 @@ from operator import truediv
 from os import path
 from re import match
 from sys import intern
-from click import IntRange
-from textx import metamodel_from_file
+from threading import Lock
 from typing import Dict, List, Union, Optional
 
 
+from ..context import current
+from ..profiling import phase, count
 from .Assignments import Assignments
+from .Grammar import load_metamodel
 from .Expression import (Annotations, ASTNode, Constructor, Accessor, Symbol, SymbolExpr,
                          Expression, AIfExpr, AQuantification, Subtype, Quantee,
                          ARImplication, AEquivalence,
@@ -132,6 +134,7 @@ class IDP(ASTNode):
     """
     def __init__(self, **kwargs):
         # log("parsing done")
+        from . import Annotate, Simplify  # monkey-patch annotate(), only needed once parsing succeeded
         self.code = None
         self.vocabularies = self.dedup_nodes(kwargs, 'vocabularies')
         self.theories = self.dedup_nodes(kwargs, 'theories')
@@ -142,12 +145,11 @@ class IDP(ASTNode):
         assert len(displays) <= 1, "Too many display blocks"
         self.display = displays[0] if len(displays) == 1 else None
 
-        for voc in self.vocabularies.values():
-            voc.annotate(self)
-        for t in self.theories.values():
-            t.annotate(self)
-        for struct in self.structures.values():
-            struct.annotate(self)
+        for block in (list(self.vocabularies.values()) + list(self.theories.values())
+                      + list(self.structures.values())):
+            with phase("annotate", block.name) as entry:
+                block.annotate(self)
+            count(entry, block)
 
         # determine default vocabulary, theory, before annotating display
         self.vocabulary = next(iter(self.vocabularies.values()))
@@ -180,7 +182,8 @@ class IDP(ASTNode):
         Returns:
             IDP: the result of parsing the IDP program
         """
-        out = idpparser.model_from_str(code)
+        with _parse_lock:
+            out = idpparser.model_from_str(code)
         out.code = code
         return out
 
@@ -199,7 +202,8 @@ class IDP(ASTNode):
         if path.exists(file_or_string):
             with open(file_or_string, "r") as source:
                 code = source.read()
-        out = idpparser.model_from_str(code)
+        with _parse_lock:
+            out = idpparser.model_from_str(code)
         out.code = code
         return out
 
@@ -425,11 +429,11 @@ class TypeDeclaration(ASTNode):
 
     def SCA_Check(self,fouten):
         # style guide check : capital letter for type
-        if self.name[0].islower():
-            fouten.append((self,f"Style guide check, type name should start with a capital letter ","Warning"))
+        if fouten.aan("type-name-capital") and self.name[0].islower():
+            fouten.append((self,f"Style guide check, type name should start with a capital letter ","Warning","type-name-capital"))
 
         # check if type has interpretation, if not check if in structures the type has given an interpretation
-        if (self.interpretation is None and not(builtIn_type(self.name))):
+        if (self.interpretation is None and not(builtIn_type(self.name)) and fouten.aan("type-interpretation")):
             structs = self.block.idp.get_blocks(self.block.idp.structures)
             list =[]
             for i in structs:
@@ -437,7 +441,7 @@ class TypeDeclaration(ASTNode):
             for s in structs :
                 if s.vocab_name == self.block.name:
                     if not(self.name in s.interpretations):
-                        fouten.append((self,f"Expected an interpretation for type {self.name} in Vocabulary {self.block.name} or Structures {list} ","Error"))
+                        fouten.append((self,f"Expected an interpretation for type {self.name} in Vocabulary {self.block.name} or Structures {list} ","Error","type-interpretation"))
                         break
 
 
@@ -563,8 +567,8 @@ class SymbolDeclaration(ASTNode):
 
     def SCA_Check(self,fouten):
         # style regel: func/pred namen met een kleine letter
-        if self.name[0].isupper():
-            fouten.append((self,f"Style guide check, predicate/function name should start with a lower letter ","Warning"))
+        if fouten.aan("symbol-name-lowercase") and self.name[0].isupper():
+            fouten.append((self,f"Style guide check, predicate/function name should start with a lower letter ","Warning","symbol-name-lowercase"))
 
 
 Type = Union[TypeDeclaration, SymbolDeclaration]
@@ -619,7 +623,7 @@ class TheoryBlock(ASTNode):
 
 class Definition(ASTNode):
     """ The class of AST nodes representing an inductive definition.
-        id (num): unique identifier for each definition
+        id (num): unique identifier for each definition (within a lint run)
 
         rules ([Rule]):
             set of rules for the definition, e.g., `!x: p(x) <- q(x)`
@@ -648,11 +652,8 @@ class Definition(ASTNode):
         inst_def_level (int): depth of recursion during instantiation
 
     """
-    definition_id = 0  # intentional static variable so that no two definitions get the same ID
-
     def __init__(self, **kwargs):
-        Definition.definition_id += 1
-        self.id = Definition.definition_id
+        self.id = next(current().definition_ids)  # per run, zie context.py
         self.annotations = kwargs.pop('annotations')
         self.annotations = self.annotations.annotations if self.annotations else {}
         self.rules = kwargs.pop('rules')
@@ -920,35 +921,44 @@ class SymbolInterpretation(ASTNode):
     def SCA_Check(self,fouten):
         #check de gedefinieerde functies, predicaten, constanten en proposities
         if (not(isinstance(self.enumeration,(Ranges,FunctionEnum))) and not(self.is_type_enumeration)):   #als predicaat, const of boolean
+            soort_fout = fouten.aan("element-type")
+            ariteit = fouten.aan("enumeration-arity")
             if self.symbol.decl.arity==0: #const en boolean
                 out_type = self.symbol.decl.out                                                 #out type functie
-                if hasattr(out_type.decl,'enumeration'):      #als type geen built-in type is
+                if soort_fout and hasattr(out_type.decl,'enumeration'):      #als type geen built-in type is
                     out_type_waardes = str(out_type.decl.enumeration).replace(" ", "").split(',')   #waardes out type
                     if self.default.str not in out_type_waardes:
-                        fouten.append((self.default,f"Element of wrong type","Error"))  # element of wrong type used for const
-            else :
+                        fouten.append((self.default,f"Element of wrong type","Error","element-type"))  # element of wrong type used for const
+            elif soort_fout or ariteit:
                 opties = []
                 for i in self.symbol.decl.sorts:    #get alle waarde van argument types
                     opties.append(str(i.decl.enumeration).replace(" ", "").split(','))
                 for t in self.enumeration.tuples:
                     if len(t.args) > self.symbol.decl.arity:    #als te veel input elementen
-                        fouten.append((t.args[0],f"To much input elements, expected {self.symbol.decl.arity}","Error"))
-                    else :
+                        if ariteit:
+                            fouten.append((t.args[0],f"To much input elements, expected {self.symbol.decl.arity}","Error","enumeration-arity"))
+                    elif soort_fout:
                         for i in range(0,len(t.args),1):  #get elements
                             if str(t.args[i]) not in opties[i]:
-                                fouten.append((t.args[i],f"Element of wrong type","Error"))  # element of wrong type used in predicate
+                                fouten.append((t.args[i],f"Element of wrong type","Error","element-type"))  # element of wrong type used in predicate
 
         if isinstance(self.enumeration,FunctionEnum):     #als functie
+            soort_fout = fouten.aan("element-type")
+            ariteit = fouten.aan("enumeration-arity")
+            # alle mogelijke combinaties, enkel nodig voor duplicates en totaliteit (kan groot zijn)
+            dubbel, totaliteit = fouten.aan("function-duplicate"), fouten.aan("function-totality")
+            volledig = dubbel or totaliteit
+            if not (soort_fout or ariteit or volledig):
+                return
             out_type = self.symbol.decl.out                                                 #out type functie
             out_type_waardes = str(out_type.decl.enumeration).replace(" ", "").split(',')   #waardes out type
             opties = []
             for i in self.symbol.decl.sorts:    #get alle waarde van argument types
                 opties.append(str(i.decl.enumeration).replace(" ", "").split(','))
 
-            # bereken alle mogelijke combinaties
             newlist = []
-            oudlist = opties[0]
-            for i in range(1,len(opties)):
+            oudlist = list(opties[0]) if volledig else []   # kopie: mogelijkheden wordt aangepast
+            for i in range(1,len(opties) if volledig else 1):
                 newlist = []
                 for a in oudlist:
                     for b in opties[i]:
@@ -965,28 +975,31 @@ class SymbolInterpretation(ASTNode):
             mogelijkheden = oudlist
             duplicates = []
             for t in self.enumeration.tuples:
-                if str(t.value) not in out_type_waardes:  # als output element van verkeerd type
-                    fouten.append((t.value,f"Output element of wrong type, {str(t.value)}","Error"))
+                if soort_fout and str(t.value) not in out_type_waardes:  # als output element van verkeerd type
+                    fouten.append((t.value,f"Output element of wrong type, {str(t.value)}","Error","element-type"))
                 elements = []
                 for i in range(0,len(t.args)-1,1):  #get input elements
-                    if (i < len(opties) and (str(t.args[i]) not in opties[i])) :
-                        fouten.append((t.args[i],f"Element of wrong type, {str(t.args[i])}","Error"))  # element of wrong type used
+                    if (soort_fout and i < len(opties) and (str(t.args[i]) not in opties[i])) :
+                        fouten.append((t.args[i],f"Element of wrong type, {str(t.args[i])}","Error","element-type"))  # element of wrong type used
                     elements.append(str(t.args[i]))
                 if len(t.args) > self.symbol.decl.arity+1:    #als te veel input elementen
-                    fouten.append((t.args[0],f"To much input elements, expected {self.symbol.decl.arity}","Error"))
+                    if ariteit:
+                        fouten.append((t.args[0],f"To much input elements, expected {self.symbol.decl.arity}","Error","enumeration-arity"))
+                elif not volledig:
+                    continue
                 elif elements in mogelijkheden:   #als mogelijkheid geldig is
                     mogelijkheden.remove(elements) #verwijder uit lijst om duplicates te vermijden
                     duplicates.append(elements) #voeg de al gebruikt mogelijkheden toe
                 elif (self.symbol.decl.arity == 1 and elements[0] in mogelijkheden): #als func met 1arg
                     mogelijkheden.remove(elements[0]) #verwijder uit lijst om duplicates te vermijden
                     duplicates.append(elements[0]) #voeg de al gebruikt mogelijkheden toe
-                elif (elements in duplicates or elements[0] in duplicates): # als duplicates
-                        fouten.append((t.args[0],f"Wrong input elements, duplicate","Error"))  #duplicate
+                elif dubbel and (elements in duplicates or elements[0] in duplicates): # als duplicates
+                        fouten.append((t.args[0],f"Wrong input elements, duplicate","Error","function-duplicate"))  #duplicate
 
-            if (len(mogelijkheden) > 0 and self.symbol.decl.arity == 1): #als functie niet voledig
-                    fouten.append((self,f"Function not total defined, missing {mogelijkheden}","Error"))
-            elif len(mogelijkheden) > 0: #als functie niet volledig
-                fouten.append((self,f"Function not total defined, missing elements","Error"))
+            if (totaliteit and len(mogelijkheden) > 0 and self.symbol.decl.arity == 1): #als functie niet voledig
+                    fouten.append((self,f"Function not total defined, missing {mogelijkheden}","Error","function-totality"))
+            elif totaliteit and len(mogelijkheden) > 0: #als functie niet volledig
+                fouten.append((self,f"Function not total defined, missing elements","Error","function-totality"))
 
 
 class Enumeration(ASTNode):
@@ -1326,19 +1339,20 @@ class Call1(ASTNode):
 
     def SCA_Check(self,fouten):
         lijst_inferenties = ["model_check","model_expand","model_propagate"]
-        if self.name in lijst_inferenties:
+        if self.name in lijst_inferenties and fouten.aan("pretty-print"):
             if self.parent.name != "pretty_print":    #check if pretty_print is used
-                fouten.append((self,f"No pretty_print used!","Warning"))
+                fouten.append((self,f"No pretty_print used!","Warning","pretty-print"))
         if self.name == "model_check":  #check if correct amount of arguments used by model_check
             if (len(self.args) > 2 or len(self.args) == 0):
-                fouten.append((self,f"Wrong number of arguments for model_check: given {len(self.args)} <-> expected {1} or {2}","Error"))
-            else :
+                if fouten.aan("model-check-arguments"):
+                    fouten.append((self,f"Wrong number of arguments for model_check: given {len(self.args)} <-> expected {1} or {2}","Error","model-check-arguments"))
+            elif fouten.aan("block-exists"):
                 a = self.parent
                 while not(isinstance(a,IDP)):   #zoek IDP node in parent
                     a = a.parent
                 for i in self.args:
                     if not(a.blockNameCheck(i)):   #check of block naam bestaat
-                        fouten.append((i,f"Block {i} does not exist!","Error"))
+                        fouten.append((i,f"Block {i} does not exist!","Error","block-exists"))
 
         for a in self.args:
             a.SCA_Check(fouten)
@@ -1374,28 +1388,34 @@ Block = Union[Vocabulary, TheoryBlock, Structure, Display]
 
 dslFile = path.join(path.dirname(__file__), 'Idp.tx')
 
-idpparser = metamodel_from_file(dslFile, memoization=True,
-                                classes=[IDP, Annotations,
-
-                                         Vocabulary, Import,
-                                         TypeDeclaration, Accessor, Subtype,
-                                         SymbolDeclaration, Symbol,
-                                         SymbolExpr,
-
-                                         TheoryBlock, Definition, Rule, AIfExpr,
-                                         AQuantification, Quantee, ARImplication,
-                                         AEquivalence, AImplication,
-                                         ADisjunction, AConjunction,
-                                         AComparison, ASumMinus, AMultDiv,
-                                         APower, AUnary, AAggregate,
-                                         AppliedSymbol, UnappliedSymbol,
-                                         Number, Brackets, Date, Variable,
-
-                                         Structure, SymbolInterpretation,
-                                         Enumeration, FunctionEnum, CSVEnumeration,
-                                         Tuple, FunctionTuple, CSVTuple,
-                                         ConstructedFrom, Constructor, Ranges,
-                                         Display,
-
-                                         Procedure, Call1, String,
-                                         PyList, PyAssignment])
+# textX vervangt __setattr__/__getattribute__ van de user classes zolang het een
+# model bouwt (inclusief IDP.__init__, dus annotate); dat is niet thread-safe,
+# dus er wordt maar één programma tegelijk geparsed.  SCA_Check kan wel parallel.
+_parse_lock = Lock()
+
+with phase("grammar"):
+    idpparser = load_metamodel(dslFile, memoization=True,
+                                    classes=[IDP, Annotations,
+
+                                             Vocabulary, Import,
+                                             TypeDeclaration, Accessor, Subtype,
+                                             SymbolDeclaration, Symbol,
+                                             SymbolExpr,
+
+                                             TheoryBlock, Definition, Rule, AIfExpr,
+                                             AQuantification, Quantee, ARImplication,
+                                             AEquivalence, AImplication,
+                                             ADisjunction, AConjunction,
+                                             AComparison, ASumMinus, AMultDiv,
+                                             APower, AUnary, AAggregate,
+                                             AppliedSymbol, UnappliedSymbol,
+                                             Number, Brackets, Date, Variable,
+
+                                             Structure, SymbolInterpretation,
+                                             Enumeration, FunctionEnum, CSVEnumeration,
+                                             Tuple, FunctionTuple, CSVTuple,
+                                             ConstructedFrom, Constructor, Ranges,
+                                             Display,
+
+                                             Procedure, Call1, String,
+                                             PyList, PyAssignment])
@@ -1,5 +1,4 @@
 from .Parse    import IDP
 
-from .Annotate import Done
-from .Simplify import Done
-
+# Annotate and Simplify monkey-patch the AST classes;
+# they are imported by IDP.__init__, when a program is annotated
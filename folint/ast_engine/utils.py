@@ -25,6 +25,8 @@ from json import JSONEncoder
 import time
 from enum import Enum, auto
 
+from ..context import current
+
 
 """
     Global Parameters:
@@ -79,13 +81,10 @@ _default.default = JSONEncoder.default  # Save unmodified default.
 JSONEncoder.default = _default  # Replace it.
 
 
-start = time.process_time()
-
-
 def log(action):
-    global start
-    print("*** ", action, round(time.process_time()-start, 3))
-    start = time.process_time()
+    run = current()     # de tijd sinds de vorige log() van deze run
+    print("*** ", action, round(time.process_time()-run.log_start, 3))
+    run.log_start = time.process_time()
 
 
 class IDPZ3Error(Exception):
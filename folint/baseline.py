@@ -0,0 +1,201 @@
+# baseline.py
+"""
+    Baseline of the known findings (`--write-baseline FILE`, `--baseline FILE`)
+
+    A legacy model can have many accepted warnings.  `--write-baseline`
+    saves the findings of a run as fingerprints; a run with `--baseline`
+    then only reports the findings that are not in it.
+
+    A fingerprint is a hash of the rule id, the name of the block and the
+    text of the AST node (or of the line, for the extra style check), with
+    the whitespace normalized: moving a block, or adding lines before it,
+    does not change it.  The same finding can occur more than once.
+
+    The baseline also has a hash of every file and block (with the blocks
+    its check depends on, see bronnen() in SCA.py).  A block whose hash did
+    not change has no new findings, so it is not checked at all; a file
+    that did not change is not even parsed.  That is only done when the
+    baseline was written by the same version of folint, with the same
+    grammar and with at least the rules of the current run; otherwise the
+    findings are only compared.
+
+    The files are named by their path relative to the directory of the
+    baseline file, so the baseline works from any working directory.
+
+    This module only uses the standard library, like cache.py.
+"""
+
+import hashlib
+import json
+import os
+
+from . import __version__
+
+FORMAT = "2"    # versie van de baseline file (paden relatief aan de baseline file)
+
+
+def normalize(text):
+    """`text` with every sequence of whitespace replaced by one space"""
+    return " ".join(text.split())
+
+
+def digest(*parts):
+    """the hash of the strings `parts`"""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def fingerprint(rule, block, text):
+    """the fingerprint of a finding of `rule` in `block` (None for the extra
+    style check) on the source `text`"""
+    return digest(rule, block or "", normalize(text))[:16]
+
+
+def key(file, root):
+    """the name of `file` in a baseline in the directory `root`: its path
+    relative to `root`, with / as separator"""
+    return os.path.relpath(os.path.abspath(file), root).replace(os.sep, "/")
+
+
+class Entry(object):
+    """the baseline of one file, while it is linted
+
+    Args:
+        known (Dict, optional): the entry of the file in the baseline
+            (--baseline), None if there is none
+        skip (bool): whether unchanged files and blocks may be skipped
+
+    Attributes:
+        data (Dict): the entry that is written (--write-baseline): the hash
+            of the file, and the hash and fingerprints per block ("blocks")
+            and of the extra style check ("extra")
+    """
+
+    def __init__(self, known=None, skip=False):
+        self.known = known
+        self.skip = skip and known is not None
+        self.data = {"hash": None, "blocks": {}}
+
+    def file(self, code, extra=False):
+        """records the source `code` of the file; whether it is unchanged,
+        so that none of its findings is new"""
+        self.data["hash"] = digest(code)
+        return (self.skip and self.known.get("hash") == self.data["hash"]
+                and (not extra or "extra" in self.known))
+
+    def unchanged(self, block, h):
+        """whether `block` (with hash `h`) is unchanged, so that it need not be checked"""
+        return self.skip and self.known.get("blocks", {}).get(block, {}).get("hash") == h
+
+    def new(self, block, h, fouten, fingerprints):
+        """records the findings of `block` (None for the extra style check);
+        the findings of `fouten` that are not in the baseline
+
+        Args:
+            h (str, optional): the hash of the block
+            fingerprints (List[str]): the fingerprint of each finding of `fouten`
+        """
+        if block is None:
+            self.data["extra"] = {"findings": list(fingerprints)}
+            oud = (self.known or {}).get("extra", {})
+        else:
+            recorded = self.data["blocks"].setdefault(block, {"hash": h, "findings": []})
+            recorded["findings"] += fingerprints
+            oud = (self.known or {}).get("blocks", {}).get(block, {})
+        bekend = {}     # aantal keer dat elke fingerprint bekend is
+        for f in oud.get("findings", []):
+            bekend[f] = bekend.get(f, 0) + 1
+        out = []
+        for fout, f in zip(fouten, fingerprints):
+            if bekend.get(f):
+                bekend[f] -= 1
+            else:
+                out.append(fout)
+        return out
+
+
+class Baseline(object):
+    """the known findings of a set of files
+
+    Args:
+        path (str): the baseline file; the files are named by their path
+            relative to its directory, so that it can be used from any
+            working directory
+        files (Dict[str, Dict]): the entry of every file, see Entry.data
+        rules (List, optional): the (rule, soort) pairs that were checked,
+            None for all rules (see rules.Selection.key)
+    """
+
+    def __init__(self, path, files=None, rules=None, version=__version__, grammar=None):
+        from .cache import grammar_hash
+        self.root = os.path.dirname(os.path.abspath(path))
+        self.files = files or {}
+        self.rules = rules
+        self.version = version
+        self.grammar = grammar or grammar_hash()
+        self.digest = None      # de hash van de ingelezen file
+
+    @classmethod
+    def load(cls, path):
+        """reads the baseline file `path`
+
+        Raises:
+            OSError: the file cannot be read
+            ValueError: the file is not a baseline of folint
+        """
+        with open(path, "rb") as f:
+            raw = f.read()
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            raise ValueError(f"{path}: not a baseline file ({e})")
+        if not isinstance(data, dict) or data.get("format") != FORMAT:
+            raise ValueError(f"{path}: not a baseline file of this version of folint")
+        out = cls(path, data["files"], data["rules"], data["version"], data["grammar"])
+        out.digest = hashlib.sha256(raw).hexdigest()
+        return out
+
+    def key(self, file):
+        """the name of `file` in this baseline"""
+        return key(file, self.root)
+
+    def save(self, path):
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump({"format": FORMAT, "version": self.version, "grammar": self.grammar,
+                       "rules": self.rules, "files": self.files}, f, indent=1, sort_keys=True)
+        os.replace(temp, path)
+
+    def add(self, file, events):
+        """adds the entry of `file` in the events of its Recorder, if any
+        (a file that could not be parsed has none)"""
+        for name, args in events:
+            if name == "baseline":
+                self.files[self.key(file)] = args[0]
+
+    def covers(self, rules):
+        """whether the rules of the baseline include the Selection `rules`"""
+        if self.rules is None:
+            return True
+        return rules is not None and rules.pairs <= {tuple(pair) for pair in self.rules}
+
+    def entry(self, file, rules):
+        """the Entry of `file`, when it is linted with the Selection `rules`"""
+        from .cache import grammar_hash
+        skip = (self.version == __version__ and self.grammar == grammar_hash()
+                and self.covers(rules))
+        return Entry(self.files.get(self.key(file)), skip)
+
+
+_loaded = {}    # {path: (mtime, Baseline)}, per proces
+
+
+def load(path):
+    """the Baseline of `path`, read once per process (again if the file changed)"""
+    mtime = os.stat(path).st_mtime_ns
+    if path not in _loaded or _loaded[path][0] != mtime:
+        _loaded[path] = (mtime, Baseline.load(path))
+    return _loaded[path][1]
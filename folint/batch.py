@@ -0,0 +1,352 @@
+# batch.py
+"""
+    Helpers to lint many .idp files in one folint run
+
+    The worker processes are started with a multiprocessing start method:
+
+        forkserver  (default where available) a server process imports the
+                    `preload` modules (textX and the idpparser metamodel)
+                    once; every worker is forked from it and shares them
+                    copy-on-write.  Safe in a process with threads.
+        fork        the workers are forked from this process, after it
+                    imported the `preload` modules itself
+        spawn       every worker starts a new interpreter and imports all
+                    modules again
+
+    The Pool of run_batch stays open for the next batches of the process
+    (watch mode, the daemon), until it exits.
+
+    The results are yielded in the order of the jobs, each one as soon as
+    those of all earlier jobs are: a job is only started when it is less
+    than BUFFER jobs per worker ahead of the first result that was not
+    yielded yet, so that a slow file does not make the results of the
+    other files pile up in memory.
+"""
+
+import atexit
+import glob
+import importlib
+import os
+import time
+from collections import deque
+from itertools import islice
+
+
+def expand_paths(paths):
+    """expand files, directories and glob patterns to a list of files
+
+    Directories are searched recursively for .idp files.
+    The result keeps the order of `paths` (matches of one directory or
+    pattern are sorted) and contains every file only once.
+
+    Args:
+        paths (List[str]): files, directories or glob patterns
+
+    Returns:
+        List[str]: the files to lint
+    """
+    files, seen = [], set()
+    for p in paths:
+        if os.path.isdir(p):
+            found = sorted(glob.glob(os.path.join(p, "**", "*.idp"), recursive=True))
+        elif glob.has_magic(p):
+            found = sorted(f for f in glob.glob(p, recursive=True) if os.path.isfile(f))
+        else:
+            found = [p]     # een gewone file, ook als die (nog) niet bestaat
+        for f in found:
+            if f not in seen:
+                seen.add(f)
+                files.append(f)
+    return files
+
+
+def missing(paths):
+    """the files and directories of `paths` that do not exist, and the glob
+    patterns that match no file ("-", stdin, always exists)"""
+    out = []
+    for p in paths:
+        if p == "-" or os.path.exists(p):
+            continue
+        if not glob.has_magic(p) or not any(os.path.isfile(f) for f in glob.iglob(p, recursive=True)):
+            out.append(p)
+    return out
+
+
+START_METHODS = ("forkserver", "fork", "spawn")
+BUFFER = 4      # per worker: jobs die gestart mogen zijn voor de eerste die nog niet af is
+
+_pools = {}     # {(processes, start method): Pool}, voor de volgende batches
+
+
+def default_method():
+    """the default start method: forkserver where available, else that of the platform"""
+    import multiprocessing
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else None
+
+
+def mp_context(method=None, preload=()):
+    """the multiprocessing context of the start `method` (the default of the
+    platform if None), whose workers have the `preload` modules imported
+
+    Raises:
+        ValueError: the start method is not available on this platform
+    """
+    import multiprocessing
+    ctx = multiprocessing.get_context(method)
+    if ctx.get_start_method() == "forkserver":
+        ctx.set_forkserver_preload(list(preload))   # vóór de server start
+    elif ctx.get_start_method() == "fork":
+        for module in preload:
+            importlib.import_module(module)     # de workers erven het
+    return ctx
+
+
+def pool(processes, method=None, preload=()):
+    """a Pool of `processes` workers, that stays open for the next batches"""
+    key = (processes, method)
+    if key not in _pools:
+        if not _pools:
+            atexit.register(close_pools)
+        _pools[key] = mp_context(method, preload).Pool(processes)
+    return _pools[key]
+
+
+def close_pools():
+    """closes the Pools of run_batch (at exit)"""
+    while _pools:
+        _, p = _pools.popitem()
+        p.close()
+        p.join()
+
+
+def run_batch(worker, jobs, processes=1, method=None, preload=()):
+    """apply `worker` on every job, in `processes` worker processes
+
+    The idpparser metamodel is built once per process (at import of
+    `ast_engine.Parse`); with the forkserver and fork start methods, it is
+    built once for all the workers, when it is in `preload`.  The workers
+    are reused for the next batches with the same `processes` and `method`.
+
+    Args:
+        worker (Callable): picklable function to apply on each job
+        jobs (List): the arguments of worker
+        processes (int): number of worker processes (0 = one per cpu)
+        method (str, optional): the start method of the workers, see START_METHODS
+        preload (Iterable[str]): modules the workers need
+
+    Returns:
+        Iterator: the results of worker, in the order of `jobs`; at most
+            BUFFER * processes results are kept until it is their turn
+    """
+    if processes == 0:
+        processes = os.cpu_count() or 1
+    if min(processes, len(jobs)) <= 1:
+        yield from map(worker, jobs)
+        return
+    p = pool(processes, method, preload)
+    todo = iter(jobs)
+    bezig = deque(p.apply_async(worker, (job,)) for job in islice(todo, BUFFER * processes))
+    while bezig:
+        result = bezig.popleft().get()
+        for job in islice(todo, 1):
+            bezig.append(p.apply_async(worker, (job,)))
+        yield result
+
+
+# --timeout en --max-memory: elke job in een worker die gestopt kan worden
+
+POLL = 0.05             # seconden tussen twee controles van de workers
+PROGRESS_SIZE = 64      # bytes voor de fase van de lopende job
+
+_progress = None        # in een worker van run_limited: de fase van de job, in gedeeld geheugen
+
+
+def progress(phase, block=None):
+    """records the phase of the job of this worker process, for when it is stopped
+
+    Called by `profiling.phase()` (see context.RunContext.progress).
+    """
+    if _progress is not None:
+        text = phase if block is None else f"{phase} {block}"
+        _progress.value = text.encode()[:PROGRESS_SIZE - 1]
+
+
+class Stopped(object):
+    """the result of a job whose worker process was stopped
+
+    Attributes:
+        kind (str): "timeout", "oom" or "crash" (the process died by itself)
+        phase (str): the last phase the job started, e.g. "check T" ("" if none)
+        elapsed (float): seconds the job ran
+        rss (int, optional): resident memory of the worker in bytes, if known
+        exitcode (int, optional): the exit code of a crashed process
+    """
+
+    def __init__(self, kind, phase, elapsed, rss=None, exitcode=None):
+        self.kind, self.phase, self.elapsed, self.rss = kind, phase, elapsed, rss
+        self.exitcode = exitcode
+
+    def where(self):
+        """how far the job got, e.g. "check of block T" """
+        if not self.phase:
+            return "before parsing"
+        name, _, block = self.phase.partition(" ")
+        return f"{name} of block {block}" if block else name
+
+    def message(self):
+        if self.kind == "crash":
+            out = f"worker process died with exit code {self.exitcode} after {self.elapsed:.1f} s"
+        else:
+            out = f"stopped after {self.elapsed:.1f} s"
+        if self.rss is not None:
+            out += f", using {self.rss / 2**20:.0f} MB"
+        return f"{self.kind}: {out}, in {self.where()}"
+
+
+def rss(pid):
+    """the resident memory of process `pid` in bytes, None if unknown (only Linux /proc)"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _serve(worker, conn, state):
+    """the loop of a worker process of run_limited"""
+    global _progress
+    _progress = state
+    while True:
+        job = conn.recv()
+        if job is None:
+            return
+        index, args = job
+        try:
+            conn.send((index, True, worker(args)))
+        except Exception as e:
+            conn.send((index, False, e))
+
+
+class _Worker(object):
+    """a worker process of run_limited (in the multiprocessing context `ctx`),
+    with the job it is doing"""
+
+    def __init__(self, worker, ctx):
+        self.progress = ctx.RawArray("c", PROGRESS_SIZE)
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_serve, args=(worker, child, self.progress),
+                                   daemon=True)
+        self.process.start()
+        child.close()
+        self.index, self.started = None, 0.0
+
+    def send(self, index, job):
+        self.progress.value = b""
+        self.index, self.started = index, time.monotonic()
+        self.conn.send((index, job))
+
+    def stopped(self, kind, memory=None, exitcode=None):
+        """kills the process (if still alive); returns the Stopped result of its job"""
+        result = Stopped(kind, self.progress.value.decode(errors="replace"),
+                         time.monotonic() - self.started, memory, exitcode)
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+        return result
+
+    def close(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+def run_limited(worker, jobs, processes=1, timeout=None, max_memory=None, method=None,
+                preload=()):
+    """apply `worker` on every job, in worker processes that are stopped
+    (and replaced) when a job takes too long or too much memory
+
+    The memory (resident set size) is checked every POLL seconds, on Linux.
+
+    Args:
+        worker (Callable): picklable function to apply on each job
+        jobs (List): the arguments of worker
+        processes (int): number of worker processes (0 = one per cpu)
+        timeout (float, optional): maximum seconds per job
+        max_memory (int, optional): maximum resident memory of a worker, in bytes
+        method (str, optional): the start method of the workers, see START_METHODS;
+            with forkserver, a stopped worker is replaced quickly
+        preload (Iterable[str]): modules the workers need
+
+    Returns:
+        Iterator: the results of worker, or Stopped, in the order of `jobs`;
+            at most BUFFER * processes results are kept until it is their turn
+    """
+    import signal
+    from multiprocessing.connection import wait
+    if processes == 0:
+        processes = os.cpu_count() or 1
+    ctx = mp_context(method, preload)
+    done, volgende = {}, 0     # resultaten die nog niet aan de beurt zijn
+    gestart = 0                # de volgende job die gestart wordt
+    window = BUFFER * processes
+
+    def start(w):
+        nonlocal gestart
+        if gestart < len(jobs) and gestart < volgende + window:
+            w.send(gestart, jobs[gestart])
+            gestart += 1
+        else:
+            w.index = None
+
+    workers = []
+    try:
+        for _ in range(max(1, min(processes, len(jobs)))):
+            workers.append(_Worker(worker, ctx))
+            start(workers[-1])
+        while volgende < len(jobs):
+            busy = {w.conn: w for w in workers if w.index is not None}
+            for conn in wait(list(busy), POLL):
+                w = busy[conn]
+                try:
+                    index, ok, result = conn.recv()
+                except EOFError:    # de worker is gestorven, bv. door de OOM killer van het OS
+                    w.process.join(1)   # de EOF kan er zijn voor het proces opgeruimd is
+                    if w.process.exitcode == -signal.SIGKILL:
+                        result = w.stopped("oom")
+                    else:               # enkel deze file mislukt
+                        result = w.stopped("crash", exitcode=w.process.exitcode)
+                    index, ok = w.index, True
+                    workers[workers.index(w)] = w = _Worker(worker, ctx)
+                if not ok:
+                    raise result
+                done[index] = result
+                start(w)
+            now = time.monotonic()
+            for i, w in enumerate(workers):
+                if w.index is None:
+                    continue
+                memory = rss(w.process.pid) if max_memory else None
+                if timeout is not None and now - w.started > timeout:
+                    done[w.index] = w.stopped("timeout", memory)
+                elif memory is not None and memory > max_memory:
+                    done[w.index] = w.stopped("oom", memory)
+                else:
+                    continue
+                workers[i] = _Worker(worker, ctx)
+                start(workers[i])
+            while volgende in done:
+                yield done.pop(volgende)
+                volgende += 1
+            for w in workers:
+                if w.index is None:
+                    start(w)    # wachtte op het venster
+    finally:
+        for w in workers:
+            if w.process.is_alive():
+                w.close()
@@ -0,0 +1,104 @@
+# cache.py
+"""
+    Content-addressed on-disk cache of lint results
+
+    An entry is keyed by a hash of the source code, the folint version,
+    the hash of the grammar (Idp.tx) and the options that change the
+    result (enabled checks, output options).
+    This module only uses the standard library: a cache hit does not
+    import textX or z3.
+"""
+
+import hashlib
+import json
+import os
+
+from . import __version__
+
+GRAMMAR = os.path.join(os.path.dirname(__file__), "ast_engine", "Idp.tx")
+DEFAULT_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                           "folint")
+DEFAULT_SIZE = 64   # MB
+FORMAT = "3"        # versie van de opgeslagen resultaten (events met rule ids, gewone syntax error messages)
+
+_grammar_hash = None
+
+
+def grammar_hash():
+    """returns the sha256 of Idp.tx (computed once per process)"""
+    global _grammar_hash
+    if _grammar_hash is None:
+        with open(GRAMMAR, "rb") as f:
+            _grammar_hash = hashlib.sha256(f.read()).hexdigest()
+    return _grammar_hash
+
+
+class ResultCache(object):
+    """directory with one JSON file per lint result
+
+    Args:
+        directory (str): the cache directory, created if needed
+        max_size (int): maximum total size in MB; the least recently used
+            entries are removed by `evict()`
+    """
+
+    def __init__(self, directory=DEFAULT_DIR, max_size=DEFAULT_SIZE):
+        self.directory = directory
+        self.max_size = max_size * 1024 * 1024
+
+    def key(self, code, options):
+        """returns the key of the result of linting `code` with `options`
+
+        Args:
+            code (str): the source code
+            options (Dict): the options that change the result (JSON serializable)
+        """
+        h = hashlib.sha256()
+        for part in (__version__, FORMAT, grammar_hash(), json.dumps(options, sort_keys=True), code):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, key):
+        """returns the cached result for `key`, or None"""
+        path = self.path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)  # recently used
+            return value
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, value):
+        """stores `value` (JSON serializable) for `key`"""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(value, f)
+        os.replace(temp, path)  # atomair, ook met meerdere workers
+
+    def evict(self):
+        """removes the least recently used entries until the cache fits in max_size"""
+        entries, total = [], 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
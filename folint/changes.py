@@ -0,0 +1,69 @@
+# changes.py
+"""
+    Changed files and lines relative to a git ref (`folint --changed-since REF`)
+
+    Uses the git command line of the local repository; the working tree
+    (including uncommitted and untracked .idp files) is compared with REF.
+"""
+
+import os
+import re
+import subprocess
+
+HUNK = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+class GitError(Exception):
+    pass
+
+
+def git(*args, cwd=None):
+    try:
+        out = subprocess.run(["git", "-c", "core.quotePath=false", *args], cwd=cwd,
+                             capture_output=True, text=True)
+    except OSError as e:
+        raise GitError(f"git is not available: {e}")
+    if out.returncode != 0:
+        raise GitError(out.stderr.strip() or f"git {' '.join(args)} failed")
+    return out.stdout
+
+
+def changed_lines(ref, cwd=None):
+    """the .idp files that changed since `ref`, with their changed lines
+
+    Args:
+        ref (str): a git ref, e.g. origin/main
+        cwd (str, optional): a directory in the git repository
+
+    Returns:
+        Dict[str, Optional[List[Tuple[int, int]]]]: the changed line ranges
+            (first and last line, 1-based) by real path of the file;
+            None for a new (untracked) file, i.e. all lines
+    """
+    top = git("rev-parse", "--show-toplevel", cwd=cwd).strip()
+    out = {}
+    file = None
+    diff = git("diff", "--no-ext-diff", "--no-color", "-U0", "--diff-filter=ACMR",
+               ref, "--", "*.idp", cwd=top)
+    for line in diff.splitlines():
+        if line.startswith("+++ "):
+            name = line[4:]
+            file = None if name == "/dev/null" else os.path.realpath(os.path.join(top, name[2:]))
+            if file:
+                out.setdefault(file, [])
+        elif file and line.startswith("@@"):
+            m = HUNK.match(line)
+            start, aantal = int(m[1]), int(m[2] if m[2] is not None else 1)
+            if aantal == 0:     # enkel verwijderde lijnen, na lijn `start`
+                out[file].append((max(start, 1), start + 1))
+            else:
+                out[file].append((start, start + aantal - 1))
+    untracked = git("ls-files", "--others", "--exclude-standard", "--", "*.idp", cwd=top)
+    for name in untracked.splitlines():
+        out[os.path.realpath(os.path.join(top, name))] = None
+    return out
+
+
+def overlaps(first, last, lines):
+    """whether the lines `first` to `last` overlap with the ranges in `lines` (None = all lines)"""
+    return lines is None or any(a <= last and first <= b for a, b in lines)
@@ -0,0 +1,110 @@
+# client.py
+"""
+    Thin client for the folint daemon (`folint --serve`)
+
+    This module only uses the standard library, so that it starts fast:
+    the daemon has textX, z3 and the idpparser metamodel already loaded.
+
+    Protocol: one JSON object per line, in both directions.
+
+    request  = {"file": str, "code": str (optional),
+                "args": {"filename": bool, "extra": bool, "fail_fast": bool,
+                         "max_findings": int (optional), "budget_ms": int (optional),
+                         "select": [str], "ignore": [str], "config": str (optional),
+                         "profile": "fast" | "full" (optional)}}
+             | {"files": [str], "args": {..., "jobs": int}}
+             | {"command": "ping" | "stop"}
+    response = {"file": str, "output": str, "aantal": int, "cached": bool,
+                "time": {"parse": float, "total": float}}
+             | {"results": [{"file": str, "output": str, "aantal": int}],
+                "time": {"total": float}}
+             | {"error": str}
+
+    With "files", the daemon lints the files in a pool of "jobs" worker
+    processes, forked from a fork server that loaded the parser once; the
+    pool is reused by the next requests.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+
+# geen tempfile/getpass: die maken het opstarten van de client merkbaar trager
+DEFAULT_SOCKET = os.path.join(os.environ.get("TMPDIR", "/tmp"), f"folint-{os.getuid()}.sock")
+
+
+def request(message, socket_path=DEFAULT_SOCKET):
+    """send one request to the daemon and return its response
+
+    Args:
+        message (Dict): the request
+        socket_path (str): path of the Unix socket of the daemon
+
+    Returns:
+        Dict: the response of the daemon
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(socket_path)
+        with s.makefile("rw", encoding="utf-8") as f:
+            f.write(json.dumps(message) + "\n")
+            f.flush()
+            return json.loads(f.readline())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SCA client for the folint daemon')
+    parser.add_argument('FILE', nargs='+', help='paths to .idp files')
+    parser.add_argument('--socket', help='path of the Unix socket of the daemon',
+                        dest='socket', default=DEFAULT_SOCKET)
+    parser.add_argument('-j', '--jobs', help='lint the files in N worker processes of the daemon (0 = one per cpu)',
+                        dest='jobs', type=int, default=1)
+    parser.add_argument('--no-timing', help='don\'t display timing information',
+                        dest='timing', action='store_false', default=True)
+    parser.add_argument('--Add-filename', help='Add filename to warning/error output',
+                        dest='filename', action='store_true', default=False)
+    parser.add_argument('--Add-extraStyle', help='Gives extra style guide warnings',
+                        dest='extra', action='store_true', default=False)
+    parser.add_argument('--fail-fast', help='stop checking a file at its first error',
+                        dest='fail_fast', action='store_true', default=False)
+    parser.add_argument('--max-findings', help='stop checking a file after N warnings and errors',
+                        dest='max_findings', metavar='N', type=int, default=None)
+    parser.add_argument('--budget-ms', help='check the expensive rules only while the file took less than MS milliseconds',
+                        dest='budget_ms', metavar='MS', type=int, default=None)
+    parser.add_argument('--select', help='only check these rules (comma separated)',
+                        dest='select', metavar='RULES', action='append', default=[])
+    parser.add_argument('--ignore', help='do not check these rules (comma separated)',
+                        dest='ignore', metavar='RULES', action='append', default=[])
+    parser.add_argument('--config', help='the project configuration file with the rule selection',
+                        dest='config', metavar='FILE', default=None)
+    parser.add_argument('--profile-set', help='the rules to check by cost (fast or full)',
+                        dest='profile_set', choices=["fast", "full"], default=None)
+    args = parser.parse_args()
+
+    options = {"filename": args.filename, "extra": args.extra, "fail_fast": args.fail_fast,
+               "max_findings": args.max_findings, "budget_ms": args.budget_ms, "select": args.select, "ignore": args.ignore,
+               "config": args.config and os.path.abspath(args.config), "profile": args.profile_set}
+    if args.jobs != 1 and len(args.FILE) > 1:
+        options["jobs"] = args.jobs
+        requests = [{"files": [os.path.abspath(file) for file in args.FILE], "args": options}]
+    else:
+        requests = [{"file": os.path.abspath(file), "args": options} for file in args.FILE]
+    for message in requests:
+        try:
+            response = request(message, args.socket)
+        except OSError as e:
+            print(f"Could not reach the folint daemon on {args.socket}: {e}")
+            sys.exit(2)
+        if "error" in response:
+            print(response["error"])
+            sys.exit(2)
+        for result in response.get("results", [response]):
+            sys.stdout.write(result["output"])
+        if args.timing:
+            print(f"\nElapsed time: {response['time']['total']} seconds"
+                  f"{' (cached)' if response.get('cached') else ''}")
+
+
+if __name__ == "__main__":
+    main()
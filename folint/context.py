@@ -0,0 +1,75 @@
+# context.py
+"""
+    The state of a lint run
+
+    Everything that belongs to one run (the Profiler, the file being
+    linted, the ids of the definitions) is kept in a RunContext, in a
+    context variable instead of in globals.  Several threads, or asyncio
+    tasks in an executor, can thus lint different sources at the same time
+    in one process.
+
+    `lint()` starts a new run for every file with `run()`; a run inherits
+    the Profiler, progress callback, `locations` and `fingerprints` of the
+    enclosing run.  The main function of a process sets the outermost run
+    with `activate()`.
+"""
+
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class RunContext(object):
+    """the state of one lint run
+
+    Attributes:
+        profiler (Profiler, optional): times the phases, with --profile
+        file (str, optional): the file that is linted
+        progress (Callable[[str, str], None], optional): called with the
+            name (and block) of every phase that starts, see batch.progress
+        rules (Selection, optional): the rules that are checked, None for all
+        locations (bool): resolve the locations of the findings (not with --summary)
+        fingerprints (bool): compute the fingerprints of the findings (--baseline,
+            --write-baseline)
+        definition_ids (Iterator[int]): the ids of the Definitions of the run
+        log_start (float): process time of the previous `utils.log()`
+    """
+
+    def __init__(self, profiler=None, file=None, progress=None, rules=None, locations=True,
+                 fingerprints=False):
+        self.profiler = profiler
+        self.file = file
+        self.progress = progress
+        self.rules = rules
+        self.locations = locations
+        self.fingerprints = fingerprints
+        self.definition_ids = itertools.count(1)
+        self.log_start = time.process_time()
+
+
+_current = ContextVar("folint_run", default=RunContext())
+
+
+def current():
+    """RunContext: the run of this thread or task"""
+    return _current.get()
+
+
+def activate(run):
+    """makes `run` the current run of this thread or task, e.g. in a worker process"""
+    _current.set(run)
+
+
+@contextmanager
+def run(file=None, profiler=None, rules=None, locations=None, fingerprints=None):
+    """context manager for a new run, with the Profiler (and progress) of the current run
+    if `profiler` is None, and its `locations` and `fingerprints` if None"""
+    outer = current()
+    token = _current.set(RunContext(profiler or outer.profiler, file, outer.progress, rules,
+                                    outer.locations if locations is None else locations,
+                                    outer.fingerprints if fingerprints is None else fingerprints))
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
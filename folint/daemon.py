@@ -0,0 +1,168 @@
+# daemon.py
+"""
+    Long-lived folint daemon (`folint --serve`)
+
+    The daemon keeps textX, z3 and the idpparser metamodel loaded, and
+    reuses the parsed (and annotated) IDP programs of recent requests.
+    Only whole programs are reused, by their source code: textX parses a
+    file as a whole and the blocks are annotated with their vocabulary, so
+    after an edit the file is parsed again.  (The language server, lsp.py,
+    does reuse the results of the unchanged blocks.)
+    A request for several files with "jobs" lints them in a pool of
+    worker processes that stays open between requests (see batch.py).
+    See `client.py` for the protocol and the thin client.
+"""
+
+import errno
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import time
+from argparse import Namespace
+from collections import OrderedDict
+from contextlib import redirect_stdout
+
+from .SCA import PRELOAD, lint, lint_worker
+from .batch import default_method, run_batch
+from .report import TextReporter, replay
+from .rules import selection, selectors
+from .ast_engine.Parse import IDP
+
+MAX_PARSED = 32     # aantal geparste programma's dat bijgehouden wordt
+
+
+class ParseCache(object):
+    """least-recently-used cache of parsed IDP programs, by source code"""
+
+    def __init__(self, size=MAX_PARSED):
+        self.size = size
+        self.parsed = OrderedDict()  # {code: IDP}
+        self.hit = False
+        self.parse_time = 0
+
+    def __call__(self, code):
+        start = time.perf_counter()
+        self.hit = code in self.parsed
+        if self.hit:
+            self.parsed.move_to_end(code)
+        else:
+            self.parsed[code] = IDP.from_str(code)
+            if len(self.parsed) > self.size:
+                self.parsed.popitem(last=False)
+        self.parse_time = time.perf_counter() - start
+        return self.parsed[code]
+
+
+class Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                response = self.server.respond(json.loads(line))
+            except Exception as e:
+                response = {"error": f"{type(e).__name__}: {e}"}
+            self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+            self.wfile.flush()
+            if self.server.stopping:
+                break
+
+
+def alive(socket_path):
+    """whether a server accepts connections on the Unix socket `socket_path`"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        try:
+            s.connect(socket_path)
+            return True
+        except OSError:     # bv. ConnectionRefusedError: niemand luistert
+            return False
+
+
+class Daemon(socketserver.UnixStreamServer):
+    """Unix socket server that lints one request at a time"""
+
+    def __init__(self, socket_path):
+        if os.path.exists(socket_path):
+            if alive(socket_path):
+                raise OSError(errno.EADDRINUSE, f"a folint daemon is already running on {socket_path}")
+            os.remove(socket_path)  # socket van een gestopte daemon
+        super().__init__(socket_path, Handler)
+        self.parse = ParseCache()
+        self.stopping = False
+
+    def respond(self, message):
+        command = message.get("command", "lint")
+        if command == "ping":
+            return {"pong": True}
+        if command == "stop":
+            self.stopping = True
+            return {"stopped": True}
+
+        start = time.perf_counter()
+        if "files" in message:
+            return self.batch(message["files"], message.get("args", {}), start)
+        file = message["file"]
+        code = message.get("code")
+        if code is None:
+            with open(file, "r") as source:
+                code = source.read()
+        args = self.namespace(file, message.get("args", {}))
+        self.parse.hit, self.parse.parse_time = False, 0
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            aantal = lint(file, args, code, self.parse)
+        return {"file": file,
+                "output": buffer.getvalue(),
+                "aantal": aantal,
+                "cached": self.parse.hit,
+                "time": {"parse": self.parse.parse_time,
+                         "total": time.perf_counter() - start}}
+
+    def batch(self, files, options, start):
+        """lints `files` in options["jobs"] worker processes"""
+        jobs = [(file, self.namespace(file, options), None, None) for file in files]
+        results = []
+        for file, events, aantal, _, _, _ in run_batch(lint_worker, jobs, options.get("jobs", 1),
+                                                       default_method(), PRELOAD):
+            buffer = io.StringIO()
+            reporter = TextReporter(buffer, options.get("filename", False))
+            reporter.file(file)
+            replay(events, reporter)
+            results.append({"file": file, "output": buffer.getvalue(), "aantal": aantal})
+        return {"results": results, "time": {"total": time.perf_counter() - start}}
+
+    def namespace(self, file, options):
+        """the command line options of a request for `file`"""
+        return Namespace(filename=options.get("filename", False),
+                         extra=options.get("extra", False),
+                         block_jobs=options.get("block_jobs", 1),
+                         fail_fast=options.get("fail_fast", False),
+                         max_findings=options.get("max_findings"),
+                         budget_ms=options.get("budget_ms"),
+                         rules=selection(selectors(options.get("select", [])) or None,
+                                         selectors(options.get("ignore", [])),
+                                         options.get("config"),
+                                         start=os.path.dirname(file),
+                                         profile=options.get("profile")),
+                         AST=False, profile=False, cache_dir=None, summary=False,
+                         baseline=None, write_baseline=None)
+
+
+def serve(socket_path):
+    """run the folint daemon on `socket_path` until it receives a stop command"""
+    try:
+        server = Daemon(socket_path)
+    except OSError as e:
+        print(f"folint daemon: {e.strerror or e}", file=sys.stderr)
+        sys.exit(2)
+    with server:
+        print(f"folint daemon listening on {socket_path}")
+        try:
+            while not server.stopping:
+                server.handle_request()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(socket_path)
@@ -0,0 +1,238 @@
+# lsp.py
+"""
+    Language Server Protocol server for folint (`folint --lsp`, on stdio)
+
+    Diagnostics are made directly from the `fouten` tuples of SCA_Check.
+    After an edit, the document is parsed again, but SCA_Check only runs
+    on the blocks whose text (or the text of the blocks they depend on)
+    changed; the diagnostics of the other blocks are reused.
+
+    The rules are selected by the project configuration (.folint) of the
+    directory of the document, see rules.py, with the fast profile unless
+    the client asks for another one (initializationOptions "profile").
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+from copy import deepcopy
+from urllib.parse import unquote, urlparse
+
+from . import context
+from .SCA import Fouten, blocks, bronnen, extra_check, locatie, stijl
+from .ast_engine.Parse import IDP
+
+DEBOUNCE = 0.3      # seconden zonder wijzigingen voor er gelint wordt
+SEVERITY = {"Error": 1, "Warning": 2}
+
+
+def read_message(stream):
+    """reads one JSON-RPC message from `stream`, or returns None at end of input"""
+    length = None
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.decode("ascii").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return json.loads(stream.read(length).decode("utf-8"))
+
+
+def write_message(stream, message):
+    body = json.dumps(message).encode("utf-8")
+    stream.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
+    stream.flush()
+
+
+def diagnostic(line, colStart, colEnd, message, soort, rule="syntax-error"):
+    """LSP diagnostic for a warning/error (line and columns start at 0)"""
+    return {"range": {"start": {"line": line, "character": colStart},
+                      "end": {"line": line, "character": max(colEnd, colStart)}},
+            "severity": SEVERITY.get(soort, 1),
+            "source": "folint",
+            "code": rule,
+            "message": message}
+
+
+def syntax_error(e):
+    """LSP diagnostic for an exception raised while parsing: a syntax error,
+    or a crash of folint itself if it has no location"""
+    line, col = getattr(e, 'line', None), getattr(e, 'col', None)
+    m = re.match(r"Error on line (\d+), col (\d+): (.*)", str(e.args[0]) if e.args else "")
+    if m:
+        return diagnostic(int(m[1])-1, int(m[2])-1, int(m[2])-1, m[3], "Error")
+    if line is not None and col is not None:
+        return diagnostic(line-1, col-1, col-1, str(e), "Error")
+    return diagnostic(0, 0, 10, f"{type(e).__name__} {e}", "Error", "crash")
+
+
+class Document(object):
+    def __init__(self, text):
+        self.text = text
+        self.checked = {}   # {block key: [diagnostic], lines relative to the block}
+        self.timer = None
+
+
+class Server(object):
+    def __init__(self, rfile, wfile):
+        self.rfile = rfile
+        self.wfile = wfile
+        self.documents = {}     # {uri: Document}
+        self.extra = False      # also run the extra style guide check
+        self.profile = "fast"   # the rules by cost, see rules.PROFILES
+        self.shutdown = False
+        self.write_lock = threading.Lock()
+        self.lint_lock = threading.Lock()
+
+    def send(self, message):
+        message["jsonrpc"] = "2.0"
+        with self.write_lock:
+            write_message(self.wfile, message)
+
+    def run(self):
+        while True:
+            message = read_message(self.rfile)
+            if message is None or message.get("method") == "exit":
+                return 0 if self.shutdown else 1
+            method = message.get("method")
+            handler = getattr(self, "on_" + method.replace("/", "_"), None) if method else None
+            if handler is not None:
+                result = handler(message.get("params", {}))
+                if "id" in message:
+                    self.send({"id": message["id"], "result": result})
+            elif "id" in message and method is not None:
+                self.send({"id": message["id"],
+                           "error": {"code": -32601, "message": f"Unknown method {method}"}})
+
+    # handlers #################################################
+
+    def on_initialize(self, params):
+        options = params.get("initializationOptions") or {}
+        self.extra = bool(options.get("extraStyle"))
+        self.profile = options.get("profile", "fast")
+        return {"capabilities": {"textDocumentSync": {"openClose": True,
+                                                      "change": 1,  # full text
+                                                      "save": {"includeText": True}}},
+                "serverInfo": {"name": "folint"}}
+
+    def on_shutdown(self, params):
+        self.shutdown = True
+        for doc in self.documents.values():
+            if doc.timer:
+                doc.timer.cancel()
+        return None
+
+    def on_textDocument_didOpen(self, params):
+        uri = params["textDocument"]["uri"]
+        self.documents[uri] = Document(params["textDocument"]["text"])
+        self.lint(uri)
+
+    def on_textDocument_didChange(self, params):
+        uri = params["textDocument"]["uri"]
+        if uri in self.documents and params["contentChanges"]:
+            self.documents[uri].text = params["contentChanges"][-1]["text"]
+            self.schedule(uri)
+
+    def on_textDocument_didSave(self, params):
+        uri = params["textDocument"]["uri"]
+        if uri in self.documents:
+            if "text" in params:
+                self.documents[uri].text = params["text"]
+            self.lint(uri)
+
+    def on_textDocument_didClose(self, params):
+        uri = params["textDocument"]["uri"]
+        doc = self.documents.pop(uri, None)
+        if doc and doc.timer:
+            doc.timer.cancel()
+        self.publish(uri, [])
+
+    # linting ##################################################
+
+    def schedule(self, uri):
+        """lint `uri` once it has not changed for DEBOUNCE seconds"""
+        doc = self.documents[uri]
+        if doc.timer:
+            doc.timer.cancel()
+        doc.timer = threading.Timer(DEBOUNCE, self.lint, [uri])
+        doc.timer.daemon = True
+        doc.timer.start()
+
+    def publish(self, uri, diagnostics):
+        self.send({"method": "textDocument/publishDiagnostics",
+                   "params": {"uri": uri, "diagnostics": diagnostics}})
+
+    def lint(self, uri):
+        with self.lint_lock:
+            doc = self.documents.get(uri)
+            if doc is None:
+                return
+            if doc.timer:
+                doc.timer.cancel()
+                doc.timer = None
+            with context.run(rules=self.rules(uri)):
+                diagnostics = self.check(doc)
+            if self.documents.get(uri) is doc:
+                self.publish(uri, diagnostics)
+
+    def rules(self, uri):
+        """the Selection of the project configuration of `uri`, None for all rules"""
+        from .rules import selection
+        parts = urlparse(uri)
+        start = os.path.dirname(unquote(parts.path)) if parts.scheme == "file" else None
+        try:
+            return selection(start=start, profile=self.profile)
+        except (OSError, ValueError) as e:
+            print(f"folint: {e}")   # op stderr, zie serve()
+            return None
+
+    def check(self, doc):
+        code = doc.text
+        try:
+            idp = IDP.from_str(code)
+        except Exception as e:
+            return [syntax_error(e)]    # diagnostics van de blokken blijven bewaard
+
+        selectie = context.current().rules
+        checked, diagnostics = {}, []
+        for soort, block in blocks(idp):
+            line, col, _ = locatie(block)
+            key = (soort, col, selectie and selectie.pairs, *bronnen(idp, soort, block))
+            if key in doc.checked:
+                relative = doc.checked[key]
+            else:
+                fouten = Fouten()
+                try:
+                    block.SCA_Check(fouten)
+                    relative = []
+                    for node, message, severity, rule in fouten:
+                        l, colStart, colEnd = locatie(node)
+                        relative.append(diagnostic(l-line, colStart-1, colEnd-1, message, severity, rule))
+                except Exception as e:  # zoals lint(): de fout van de check, bij het begin van het blok
+                    relative = [diagnostic(0, col-1, col-1+len(block.name),
+                                           f"{type(e).__name__} {e}", "Error", "crash")]
+            checked[key] = relative
+            for d in relative:
+                d = deepcopy(d)     # kopie, met absolute lijnnummers
+                d["range"]["start"]["line"] += line-1
+                d["range"]["end"]["line"] += line-1
+                diagnostics.append(d)
+        doc.checked = checked
+
+        if self.extra and stijl(selectie):
+            for line, colStart, colEnd, message, severity, rule in extra_check(code.splitlines(keepends=True), Fouten()):
+                diagnostics.append(diagnostic(line-1, colStart, colEnd, message, severity, rule))
+        return diagnostics
+
+
+def serve():
+    """run the language server on stdin/stdout until the client exits"""
+    rfile, wfile = sys.stdin.buffer, sys.stdout.buffer
+    sys.stdout = sys.stderr     # print() mag het protocol niet verstoren
+    sys.exit(Server(rfile, wfile).run())
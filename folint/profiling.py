@@ -0,0 +1,160 @@
+# profiling.py
+"""
+    Per-phase profiling of folint (`folint --profile`)
+
+    The phases of a lint run are timed with `phase()`:
+
+        grammar  : building the idpparser metamodel (once per process)
+        parse    : idpparser.model_from_str, without the annotation
+        annotate : annotate() of a vocabulary, theory or structure
+        check    : SCA_Check of a block
+        extra    : the extra style guide check
+
+    Wall and CPU time are measured separately; the time of a nested phase
+    (annotate within parse) is not counted in the enclosing one, so that
+    the phases add up.  When no Profiler is active, `phase()` costs one
+    context variable lookup.
+
+    The Profiler of a run is kept in its RunContext (see context.py), so
+    that concurrent runs in one process each have their own.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from .context import current
+
+PHASES = ["grammar", "parse", "annotate", "check", "extra"]
+
+_inactive = nullcontext()
+
+
+class Entry(object):
+    """one timed phase"""
+    __slots__ = ("file", "phase", "block", "wall", "cpu", "nodes")
+
+    def __init__(self, file, phase, block):
+        self.file, self.phase, self.block = file, phase, block
+        self.wall, self.cpu, self.nodes = 0.0, 0.0, None
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Profiler(object):
+    """collects the timed phases of a lint run"""
+
+    def __init__(self):
+        self.entries = []
+        self._stack = threading.local()     # de lopende fases, per thread
+
+    @contextmanager
+    def phase(self, name, block=None, file=None):
+        entry = Entry(file, name, block)
+        stack = self._stack.__dict__.setdefault("entries", [])
+        stack.append(entry)
+        self.entries.append(entry)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield entry
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            stack.pop()
+            entry.wall += wall
+            entry.cpu += cpu
+            if stack:   # niet meetellen in de omvattende fase
+                stack[-1].wall -= wall
+                stack[-1].cpu -= cpu
+
+    def extend(self, entries):
+        """adds the entries of another Profiler (e.g. of a worker process), as dicts"""
+        for d in entries:
+            entry = Entry(d["file"], d["phase"], d["block"])
+            entry.wall, entry.cpu, entry.nodes = d["wall"], d["cpu"], d["nodes"]
+            self.entries.append(entry)
+
+    def totals(self):
+        """Dict[str, Dict]: wall time, cpu time, node count and number of entries, per phase"""
+        out = {}
+        for entry in self.entries:
+            total = out.setdefault(entry.phase, {"wall": 0.0, "cpu": 0.0, "nodes": 0, "count": 0})
+            total["wall"] += entry.wall
+            total["cpu"] += entry.cpu
+            total["nodes"] += entry.nodes or 0
+            total["count"] += 1
+        return {p: out[p] for p in PHASES + sorted(out) if p in out}
+
+    def files(self):
+        """List[Tuple[str, float, float]]: wall and cpu time per file, slowest first"""
+        out = {}
+        for entry in self.entries:
+            if entry.file is not None:
+                wall, cpu = out.get(entry.file, (0.0, 0.0))
+                out[entry.file] = (wall + entry.wall, cpu + entry.cpu)
+        return sorted(((f, w, c) for f, (w, c) in out.items()), key=lambda x: -x[1])
+
+    def as_json(self):
+        return json.dumps({"phases": [e.as_dict() for e in self.entries],
+                           "totals": self.totals(),
+                           "files": [{"file": f, "wall": w, "cpu": c} for f, w, c in self.files()]},
+                          ensure_ascii=False)
+
+    def table(self):
+        lines = [f"{'phase':10} {'file':30} {'block':12} {'wall ms':>9} {'cpu ms':>9} {'nodes':>7}"]
+        for e in self.entries:
+            nodes = "" if e.nodes is None else e.nodes
+            lines.append(f"{e.phase:10} {str(e.file or ''):30} {str(e.block or ''):12} "
+                         f"{e.wall*1000:9.2f} {e.cpu*1000:9.2f} {nodes:>7}")
+        lines.append("")
+        lines.append(f"{'phase':10} {'count':>5} {'wall ms':>9} {'cpu ms':>9} {'nodes':>7}")
+        for p, t in self.totals().items():
+            lines.append(f"{p:10} {t['count']:5} {t['wall']*1000:9.2f} {t['cpu']*1000:9.2f} {t['nodes']:7}")
+        if len(self.files()) > 1:
+            lines.append("")
+            lines.append(f"{'file':41} {'wall ms':>9} {'cpu ms':>9}")
+            for f, w, c in self.files():
+                lines.append(f"{f:41} {w*1000:9.2f} {c*1000:9.2f}")
+        return "\n".join(lines)
+
+
+def active():
+    """the Profiler of the current run, None when not profiling"""
+    return current().profiler
+
+
+def phase(name, block=None):
+    """context manager that times phase `name` (of `block`) in the Profiler of the current run, if any
+
+    It gives the Entry of the phase (None when not profiling), see `count`.
+    """
+    run = current()
+    if run.progress is not None:
+        run.progress(name, block)
+    if run.profiler is None:
+        return _inactive
+    return run.profiler.phase(name, block, run.file)
+
+
+def count(entry, node):
+    """sets the number of AST nodes of the phase `entry`, to the number of nodes in `node`
+
+    The nodes are counted after the phase, so that it does not change its timing.
+    """
+    if entry is None:
+        return
+    n, todo = 0, [node]
+    while todo:
+        elem = todo.pop()
+        n += 1
+        for name, attr in getattr(type(elem), "_tx_attrs", {}).items():
+            if not attr.cont:
+                continue
+            value = getattr(elem, name, None)   # annotate() verwijdert soms attributen
+            if isinstance(value, dict):
+                value = list(value.values())
+            elif not isinstance(value, list):
+                value = [value]
+            todo.extend(v for v in value if hasattr(type(v), "_tx_attrs"))
+    entry.nodes = n
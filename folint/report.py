@@ -0,0 +1,468 @@
+# report.py
+"""
+    Output formats of folint
+
+    The lint functions of SCA.py report what they find to a Reporter, as
+    soon as a block is checked.  The Reporter writes it in its format:
+
+        text  : the classic output, 'Warning: line .. - colStart .. - colEnd .. => message'
+        jsonl : one JSON object per line
+        sarif : a SARIF 2.1.0 log, written incrementally
+
+    With --summary, only the number of findings per file, severity and
+    rule is reported (a table, or JSON lines), see SummaryReporter.
+
+    In batch mode, the worker processes use a Recorder; its events are
+    replayed on the Reporter of the main process, in file order.
+"""
+
+import json
+import sys
+
+from . import __version__
+
+
+def per_reason(skipped):
+    """the rules of `skipped` (see rules.Selection) by the reason they were skipped"""
+    out = {}
+    for rule, reason in (skipped or {}).items():
+        out.setdefault(reason, []).append(rule)
+    return out
+
+
+class Reporter(object):
+    """writes the results of a lint run to `stream`
+
+    Args:
+        stream: where to write to (sys.stdout by default)
+        add_filename (bool): add the filename to each warning/error (text format)
+    """
+
+    def __init__(self, stream=None, add_filename=False):
+        self.stream = stream or sys.stdout
+        self.add_filename = add_filename
+        self.files = 0          # aantal files in deze run
+        self.filename = None    # de file die nu gelint wordt
+        self.block_name = None  # het blok dat nu gecontroleerd wordt
+        self.niet_gelint = {}   # aantal files die niet gelint zijn, per reden
+
+    def write(self, text):
+        self.stream.write(text + "\n")
+
+    def begin(self, files):
+        """start of the run, with the number of files that will be linted"""
+        self.files = files
+        self.niet_gelint = {}
+
+    def not_linted(self, reden):
+        """counts the current file as not linted, because of `reden` (e.g. "timeout")"""
+        self.niet_gelint[reden] = self.niet_gelint.get(reden, 0) + 1
+
+    def file(self, filename):
+        """start of the results of `filename`"""
+        self.filename, self.block_name = filename, None
+
+    def section(self, soort):
+        """start of the checks of the blocks of a kind (Vocabulary, Structure, ...)"""
+
+    def block(self, naam):
+        """start of the results of the block `naam`"""
+        self.block_name = naam
+
+    def findings(self, soort, lijst):
+        """the warnings or errors (`soort`) of a block
+
+        Args:
+            soort (str): "Error" or "Warning"
+            lijst (List[Tuple[int, int, int, str, str]]): line, colStart, colEnd, message and rule
+        """
+
+    def extra(self, lijst):
+        """the findings of the extra style guide check
+
+        Args:
+            lijst (List[Tuple[int, int, int, str, str, str]]): line, colStart, colEnd, message, soort and rule
+        """
+
+    def error(self, soort, line, colStart, colEnd, message):
+        """the file could not be checked"""
+
+    def syntax_error(self, soort, line, colStart, colEnd, message):
+        """the file could not be parsed"""
+        self.error(soort, line, colStart, colEnd, message)
+
+    def limit(self, kind, fase, message):
+        """the lint of the file was stopped (--timeout, --max-memory), or it
+        crashed; the file is counted as not linted, not as a finding
+
+        Args:
+            kind (str): "timeout", "oom" or "crash"
+            fase (str): the phase it reached, e.g. "check of block T"
+            message (str): the description of what happened
+        """
+        self.not_linted(kind)
+        self.error("Error", 0, 0, 0, message)
+
+    def incomplete(self, budget, lijst):
+        """the checks that did not complete within the time budget (--budget-ms)
+
+        Args:
+            budget (int): the budget, in milliseconds
+            lijst (List[Tuple[List[str], List[str]]]): rules, and the blocks
+                whose check of these rules did not complete (None for the
+                extra style guide check)
+        """
+
+    def message(self, text):
+        """other output, e.g. the AST"""
+
+    def baseline(self, entry):
+        """the baseline entry of the file (--write-baseline), see baseline.Entry.data"""
+
+    def total(self, aantal):
+        """end of the results of the current file"""
+
+    def end(self, totaal, cache=None, skipped=None):
+        """end of the run
+
+        Args:
+            totaal (int): number of warnings and errors in all files
+            cache (Tuple[int, int], optional): cache hits and misses
+            skipped (Dict[str, str], optional): the rules that were not
+                checked, with the reason (see rules.Selection)
+        """
+
+
+class TextReporter(Reporter):
+
+    def location(self, soort, line, colStart, colEnd, message):
+        out = f"{soort}: line {line} - colStart {colStart} - colEnd {colEnd} => {message}"
+        return f"{self.filename}: {out}" if self.add_filename else out
+
+    def file(self, filename):
+        super().file(filename)
+        if self.files > 1:
+            self.write(f"\n========== {filename} ==========")
+
+    def section(self, soort):
+        self.write(f"\n---------- {soort} Check ----------")
+
+    def block(self, naam):
+        super().block(naam)
+        self.write(f"----- {naam}")
+
+    def findings(self, soort, lijst):
+        self.write(f"-- {soort} : aantal = {len(lijst)}")
+        for line, colStart, colEnd, message, _ in lijst:
+            self.write(self.location(soort, line, colStart, colEnd, message))
+
+    def extra(self, lijst):
+        self.write(f"\n---------- Extra Style Guide Check: aantal = {len(lijst)} ----------")
+        for line, colStart, colEnd, message, soort, _ in lijst:
+            self.write(self.location(soort, line, colStart, colEnd, message))
+
+    def error(self, soort, line, colStart, colEnd, message):
+        self.write(self.location(soort, line, colStart, colEnd, message))
+
+    def syntax_error(self, soort, line, colStart, colEnd, message):
+        self.write("\n---------- Syntax Error ----------")
+        self.error(soort, line, colStart, colEnd, message)
+
+    def limit(self, kind, fase, message):
+        self.not_linted(kind)
+        self.write(f"\n---------- {kind.capitalize()} ----------")
+        self.error("Error", 0, 0, 0, message)
+
+    def incomplete(self, budget, lijst):
+        self.write(f"\n---------- Incomplete: budget of {budget} ms used up ----------")
+        for rules, blokken in lijst:
+            waar = ", ".join("extra style check" if b is None else b for b in blokken)
+            self.write(f"-- not completed in {waar}: {', '.join(rules)}")
+
+    def message(self, text):
+        self.write(text)
+
+    def total(self, aantal):
+        self.write(f"\n---------- Totaal aantal fouten {aantal} ----------")
+
+    def end(self, totaal, cache=None, skipped=None):
+        if self.files > 1:
+            self.write(f"\n========== Totaal aantal fouten {totaal} in {self.files} files ==========")
+        for reden, aantal in self.niet_gelint.items():
+            self.write(f"Not linted ({reden}): {aantal} files")
+        for reason, rules in per_reason(skipped).items():
+            self.write(f"Skipped ({reason}): {', '.join(rules)}")
+        if cache is not None:
+            self.write(f"Cache: {cache[0]} hits, {cache[1]} misses")
+
+
+class JsonLinesReporter(Reporter):
+    """one JSON object per finding, per file and for the whole run"""
+
+    def emit(self, **obj):
+        self.write(json.dumps(obj, ensure_ascii=False))
+        self.stream.flush()
+
+    def finding(self, soort, line, colStart, colEnd, message, check, rule):
+        self.emit(type="finding", file=self.filename, block=self.block_name, check=check,
+                  rule=rule, severity=soort, line=line, colStart=colStart, colEnd=colEnd,
+                  message=message)
+
+    def findings(self, soort, lijst):
+        for line, colStart, colEnd, message, rule in lijst:
+            self.finding(soort, line, colStart, colEnd, message, "sca", rule)
+
+    def extra(self, lijst):
+        self.block_name = None
+        for line, colStart, colEnd, message, soort, rule in lijst:
+            self.finding(soort, line, colStart, colEnd, message, "extra", rule)
+
+    def error(self, soort, line, colStart, colEnd, message):
+        self.finding(soort, line, colStart, colEnd, message, "syntax", "syntax-error")
+
+    def limit(self, kind, fase, message):
+        self.not_linted(kind)
+        self.emit(type="finding", file=self.filename, block=None, check="limit", rule=kind,
+                  severity="Error", line=0, colStart=0, colEnd=0, message=message, phase=fase)
+
+    def incomplete(self, budget, lijst):
+        for rules, blokken in lijst:
+            self.emit(type="incomplete", file=self.filename, budget_ms=budget, rules=list(rules),
+                      blocks=list(blokken))
+
+    def message(self, text):
+        self.emit(type="message", file=self.filename, message=text)
+
+    def total(self, aantal):
+        self.emit(type="file", file=self.filename, aantal=aantal)
+
+    def end(self, totaal, cache=None, skipped=None):
+        summary = {"type": "summary", "files": self.files, "aantal": totaal}
+        if self.niet_gelint:
+            summary["not_linted"] = self.niet_gelint
+        if cache is not None:
+            summary["cache"] = {"hits": cache[0], "misses": cache[1]}
+        if skipped:
+            summary["skipped"] = skipped
+        self.emit(**summary)
+
+
+class SarifReporter(Reporter):
+    """SARIF 2.1.0 log; every result is written as soon as it is reported"""
+
+    SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+    LEVEL = {"Error": "error", "Warning": "warning"}
+
+    def begin(self, files):
+        super().begin(files)
+        self.results = 0
+        self.notifications = []    # de checks die niet volledig waren (--budget-ms)
+        from .rules import RULES
+        tool = {"driver": {"name": "folint", "version": __version__,
+                           "informationUri": "https://github.com/larsver/folint",
+                           "rules": [{"id": rule, "shortDescription": {"text": r.description}}
+                                     for rule, r in RULES.items()]}}
+        self.stream.write('{"version": "2.1.0", "$schema": ' + json.dumps(self.SCHEMA)
+                          + ', "runs": [{"tool": ' + json.dumps(tool) + ', "results": [\n')
+
+    def result(self, soort, line, colStart, colEnd, message, check, rule):
+        region = {"startLine": max(line, 1), "startColumn": max(colStart, 1),
+                  "endColumn": max(colEnd, colStart, 1)}
+        result = {"ruleId": rule,
+                  "level": self.LEVEL.get(soort, "error"),
+                  "message": {"text": message},
+                  "locations": [{"physicalLocation": {
+                      "artifactLocation": {"uri": self.filename},
+                      "region": region}}],
+                  "properties": {"check": check}}
+        if self.block_name is not None:
+            result["properties"]["block"] = self.block_name
+        self.stream.write((",\n" if self.results else "") + json.dumps(result, ensure_ascii=False))
+        self.stream.flush()
+        self.results += 1
+
+    def findings(self, soort, lijst):
+        for line, colStart, colEnd, message, rule in lijst:
+            self.result(soort, line, colStart, colEnd, message, "sca", rule)
+
+    def extra(self, lijst):
+        self.block_name = None
+        for line, colStart, colEnd, message, soort, rule in lijst:  # kolommen van extra_check starten bij 0
+            self.result(soort, line, colStart + 1, colEnd + 1, message, "extra", rule)
+
+    def error(self, soort, line, colStart, colEnd, message):
+        self.result(soort, line, colStart, colEnd, message, "syntax", "syntax-error")
+
+    def limit(self, kind, fase, message):
+        self.not_linted(kind)
+        self.block_name = None
+        self.result("Error", 0, 0, 0, message, "limit", kind)
+
+    def incomplete(self, budget, lijst):
+        for rules, blokken in lijst:
+            self.notifications.append({
+                "level": "warning",
+                "message": {"text": f"checks not completed within the budget of {budget} ms"},
+                "locations": [{"physicalLocation": {"artifactLocation": {"uri": self.filename}}}],
+                "properties": {"rules": list(rules), "blocks": list(blokken)}})
+
+    def end(self, totaal, cache=None, skipped=None):
+        properties = {"files": self.files, "aantal": totaal}
+        if self.niet_gelint:
+            properties["not_linted"] = self.niet_gelint
+        if cache is not None:
+            properties["cache"] = {"hits": cache[0], "misses": cache[1]}
+        if skipped:
+            properties["skipped"] = skipped
+        invocations = ""
+        if self.notifications:
+            invocations = ', "invocations": ' + json.dumps([{
+                "executionSuccessful": True,
+                "toolExecutionNotifications": self.notifications}], ensure_ascii=False)
+        self.stream.write('\n]' + invocations + ', "properties": ' + json.dumps(properties) + '}]}\n')
+        self.stream.flush()
+
+
+class SummaryReporter(Reporter):
+    """the number of warnings and errors per file, severity and rule (--summary)
+
+    The locations and messages of the findings are not used (with --summary
+    they are not resolved, see context.RunContext.locations).  A line is
+    written per file as soon as it is done; only the totals are kept.  As
+    in the other formats, a file that could not be parsed is not counted as
+    a finding; it is listed as not linted.
+    """
+
+    def begin(self, files):
+        super().begin(files)
+        self.severities, self.rules = {}, {}    # totalen
+        self.open = False                       # de lijn van de huidige file moet nog geschreven worden
+        self.write(f"{'Error':>7} {'Warning':>8}  file")
+
+    def file(self, filename):
+        self.close_file()
+        super().file(filename)
+        self.file_severities, self.file_rules = {}, {}
+        self.reden = None   # waarom de file niet gelint is
+        self.open = True
+
+    def close_file(self):
+        """writes the line of the current file, also when it had no total (e.g. a syntax error)"""
+        if self.open:
+            self.total(sum(self.file_severities.values()))
+
+    def tel(self, soort, rule, aantal=1):
+        for telling, key in ((self.file_severities, soort), (self.severities, soort),
+                             (self.file_rules, rule), (self.rules, rule)):
+            telling[key] = telling.get(key, 0) + aantal
+
+    def findings(self, soort, lijst):
+        for *_, rule in lijst:
+            self.tel(soort, rule)
+
+    def extra(self, lijst):
+        for *_, soort, rule in lijst:
+            self.tel(soort, rule)
+
+    def error(self, soort, line, colStart, colEnd, message):
+        if self.reden is None:
+            self.reden = "syntax-error"
+            self.not_linted(self.reden)
+
+    def limit(self, kind, fase, message):
+        if self.reden is None:
+            self.reden = kind
+            self.not_linted(kind)
+
+    def row(self, severities, label):
+        return f"{severities.get('Error', 0):7} {severities.get('Warning', 0):8}  {label}"
+
+    def total(self, aantal):
+        label = self.filename if self.reden is None else f"{self.filename} (not linted: {self.reden})"
+        self.write(self.row(self.file_severities, label))
+        self.open = False
+
+    def end(self, totaal, cache=None, skipped=None):
+        self.close_file()
+        self.write(self.row(self.severities, f"Totaal aantal fouten {totaal} in {self.files} files"))
+        for reden, aantal in self.niet_gelint.items():
+            self.write(f"Not linted ({reden}): {aantal} files")
+        if self.rules:
+            self.write(f"\n{'aantal':>7}  rule")
+            for rule, aantal in sorted(self.rules.items(), key=lambda r: (-r[1], r[0])):
+                self.write(f"{aantal:7}  {rule}")
+        for reason, rules in per_reason(skipped).items():
+            self.write(f"Skipped ({reason}): {', '.join(rules)}")
+        if cache is not None:
+            self.write(f"Cache: {cache[0]} hits, {cache[1]} misses")
+
+
+class JsonSummaryReporter(SummaryReporter):
+    """--summary --format jsonl: a "file" object per file and a final "summary" """
+
+    def begin(self, files):
+        Reporter.begin(self, files)
+        self.severities, self.rules = {}, {}
+        self.open = False
+
+    def emit(self, **obj):
+        self.write(json.dumps(obj, ensure_ascii=False))
+        self.stream.flush()
+
+    def total(self, aantal):
+        obj = dict(type="file", file=self.filename, aantal=aantal,
+                   severities=self.file_severities, rules=self.file_rules)
+        if self.reden is not None:
+            obj["not_linted"] = self.reden
+        self.emit(**obj)
+        self.open = False
+
+    def end(self, totaal, cache=None, skipped=None):
+        self.close_file()
+        summary = {"type": "summary", "files": self.files, "aantal": totaal,
+                   "severities": self.severities, "rules": self.rules}
+        if self.niet_gelint:
+            summary["not_linted"] = self.niet_gelint
+        if cache is not None:
+            summary["cache"] = {"hits": cache[0], "misses": cache[1]}
+        if skipped:
+            summary["skipped"] = skipped
+        self.emit(**summary)
+
+
+REPORTERS = {"text": TextReporter, "jsonl": JsonLinesReporter, "sarif": SarifReporter}
+SUMMARY_REPORTERS = {"text": SummaryReporter, "jsonl": JsonSummaryReporter}
+
+
+def make_reporter(args, stream=None):
+    """the Reporter of the command line options (--format, --summary)"""
+    reporters = SUMMARY_REPORTERS if args.summary else REPORTERS
+    return reporters[args.format](stream or sys.stdout, args.filename)
+
+
+class Recorder(Reporter):
+    """keeps the reported events, to replay them later (e.g. in another process),
+    and passes them on to `forward`, if given"""
+
+    EVENTS = ["section", "block", "findings", "extra", "error", "syntax_error", "limit", "incomplete",
+              "message", "baseline", "total"]
+
+    def __init__(self, forward=None):
+        super().__init__()
+        self.events = []    # [(method name, args)], JSON serializable
+        self.forward = forward
+        for name in self.EVENTS:
+            setattr(self, name, self._recorder(name))
+
+    def _recorder(self, name):
+        def record(*args):
+            self.events.append((name, args))
+            if self.forward is not None:
+                getattr(self.forward, name)(*args)
+        return record
+
+
+def replay(events, reporter):
+    """reports the `events` of a Recorder to `reporter`"""
+    for name, args in events:
+        getattr(reporter, name)(*args)
@@ -0,0 +1,263 @@
+# rules.py
+"""
+    The checks of folint, by rule id, and the selection of the rules
+
+    Every warning/error of SCA_Check is a tuple (node, message, soort, rule)
+    in `fouten`; the extra style guide check adds (line, colStart, colEnd,
+    message, soort, rule).  The rule ids are listed here, with the cost of
+    their check:
+
+        constant    a fixed amount of work per node (e.g. a naming check)
+        linear      grows with the size of an expression, enumeration or
+                    file (e.g. the types of the arguments of a symbol)
+        domain      grows with the product of the sizes of the domains
+                    (the totality of a function enumeration)
+
+    A profile is a set of cost classes: `fast` (for an editor, on every
+    change) skips the domain checks, `full` (the default, e.g. for CI)
+    checks everything.
+
+    Which rules are checked is decided by, in this order:
+
+        folint/config.txt   the defaults of the installation
+        .folint             the project configuration, in the current
+                            directory or a parent directory (or --config FILE)
+        --select, --ignore  the command line
+
+    A configuration file has lines `select = ...`, `ignore = ...` and
+    `profile = ...` (and comments starting with #).  The value of select
+    and ignore is a comma separated list of rule ids, patterns such as
+    `style-*`, or a severity (`error`, `warning`).  A `select` replaces the
+    selection of the previous levels, an `ignore` is added to theirs, and
+    the last profile (--profile-set on the command line) is applied to the
+    result.  The rules that are not selected are not checked at
+    all (see SCA.Fouten).  A file that could not be linted (syntax-error,
+    timeout, oom, crash) is always reported.
+"""
+
+import fnmatch
+import os
+from typing import NamedTuple, Tuple
+
+
+class Rule(NamedTuple):
+    severities: Tuple[str, ...]     # de soorten fouten die de regel kan melden
+    cost: str                       # in COSTS
+    description: str
+
+
+E, W, EW = ("Error",), ("Warning",), ("Error", "Warning")
+COSTS = ("constant", "linear", "domain")
+
+RULES = {
+    # SCA_Check van de blokken
+    "unused-variable": Rule(W, "constant", "a quantified variable is not used"),
+    "universal-conjunction": Rule(W, "constant", "conjunction directly after a universal quantifier"),
+    "existential-implication": Rule(W, "constant", "implication directly after an existential quantifier"),
+    "equivalence-variable": Rule(W, "linear", "variable occurring on one side of an equivalence only"),
+    "unknown-type": Rule(W, "linear", "the type of an expression could not be determined"),
+    "comparison-type": Rule(EW, "linear", "comparison of different types"),
+    "sum-type": Rule(EW, "linear", "sum or difference of incompatible types"),
+    "product-type": Rule(EW, "linear", "multiplication or division of incompatible types"),
+    "negated-in-brackets": Rule(W, "constant", "negated in-statement without brackets"),
+    "arity": Rule(E, "constant", "wrong number of arguments of a symbol"),
+    "argument-type": Rule(EW, "linear", "argument of a symbol of the wrong or unknown type"),
+    "element-type": Rule(E, "linear", "element of the wrong type in an enumeration"),
+    "redundant-brackets": Rule(W, "constant", "redundant brackets"),
+    "type-name-capital": Rule(W, "constant", "type name does not start with a capital"),
+    "type-interpretation": Rule(E, "linear", "type without interpretation"),
+    "symbol-name-lowercase": Rule(W, "constant", "predicate or function name does not start with a lower case letter"),
+    "enumeration-arity": Rule(E, "constant", "too many elements in a tuple of an enumeration"),
+    "function-duplicate": Rule(E, "domain", "duplicate input in a function enumeration"),
+    "function-totality": Rule(E, "domain", "function enumeration that is not total"),
+    "pretty-print": Rule(W, "constant", "model printed without pretty_print"),
+    "model-check-arguments": Rule(E, "constant", "wrong number of arguments of model_check"),
+    "block-exists": Rule(E, "linear", "procedure uses a block that does not exist"),
+    # extra style guide check (--Add-extraStyle), per lijn van de file
+    "style-comma-spacing": Rule(W, "linear", "space before a comma"),
+    "style-comment-line": Rule(W, "linear", "comment not on a separate line"),
+    "style-one-rule-per-line": Rule(W, "linear", "more than one rule on a line"),
+    "style-indentation": Rule(W, "linear", "missing indentation"),
+    "style-symbol-consistency": Rule(W, "linear", "mix of unicode and ASCII symbols"),
+    "style-duplicate-line": Rule(W, "linear", "duplicate line in a theory or procedure"),
+    # de file kon niet gelint worden
+    "syntax-error": Rule(E, "constant", "the file could not be parsed"),
+    "timeout": Rule(E, "constant", "the file took longer than --timeout"),
+    "oom": Rule(E, "constant", "the file took more memory than --max-memory"),
+    "crash": Rule(E, "constant", "the worker process of the file died"),
+}
+
+ALWAYS = ("syntax-error", "timeout", "oom", "crash")     # de file kon niet gecontroleerd worden
+
+PROFILES = {
+    "fast": ("constant", "linear"),     # in een editor, bij elke wijziging
+    "full": COSTS,                      # in CI
+}
+
+CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.txt")
+PROJECT_CONFIG = ".folint"
+
+SEVERITIES = {"error": "Error", "warning": "Warning"}
+
+_defaults = None    # de configuratie van folint/config.txt, eenmaal ingelezen
+
+
+class Selection(object):
+    """the rules that are checked, as (rule, soort) pairs
+
+    Attributes:
+        pairs (FrozenSet[Tuple[str, str]]): the selected rules and severities
+        rules (FrozenSet[str]): the rules with at least one selected severity
+        skipped (Dict[str, str]): the rules that are not checked, with the reason
+    """
+
+    def __init__(self, pairs, reasons=None):
+        self.pairs = frozenset(pairs)
+        self.rules = frozenset(rule for rule, _ in self.pairs)
+        reasons = reasons or {}
+        self.skipped = {rule: reasons.get(rule, "not selected")
+                        for rule in RULES if rule not in self.rules and rule not in ALWAYS}
+
+    def key(self):
+        """JSON serializable form, e.g. for the cache key"""
+        return sorted(self.pairs)
+
+
+def passes(selectie=None):
+    """the rules of SCA_Check in `selectie` (all if None) per cost class, cheapest first
+
+    Returns:
+        List[Tuple[str, Selection]]: the cost classes with at least one rule
+    """
+    out = []
+    for cost in COSTS:
+        pairs = {(rule, soort) for rule, r in RULES.items() for soort in r.severities
+                 if r.cost == cost and rule not in ALWAYS and not rule.startswith("style-")
+                 and (selectie is None or (rule, soort) in selectie.pairs)}
+        if pairs:
+            out.append((cost, Selection(pairs)))
+    return out
+
+
+def matches(selector):
+    """the (rule, soort) pairs of one selector: a rule id, a pattern or a severity
+
+    Raises:
+        ValueError: the selector matches no rule
+    """
+    if selector.lower() in SEVERITIES:
+        soort = SEVERITIES[selector.lower()]
+        return {(rule, soort) for rule, r in RULES.items() if soort in r.severities}
+    rules = fnmatch.filter(RULES, selector)
+    if not rules:
+        raise ValueError(f"unknown rule: {selector}")
+    return {(rule, soort) for rule in rules for soort in RULES[rule].severities}
+
+
+def selectors(values):
+    """the selectors in a list of comma separated values"""
+    return [s.strip() for value in values for s in value.split(",") if s.strip()]
+
+
+def read_config(path):
+    """the select (None if not given) and ignore selectors, and the profile
+    (None if not given), of a configuration file
+
+    Raises:
+        ValueError: a line that is not `select = ...`, `ignore = ...` or
+            `profile = ...`, or an unknown profile
+    """
+    config = {"select": None, "ignore": [], "profile": None}
+    with open(path, encoding="utf-8") as f:
+        for nr, line in enumerate(f, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            key, sep, value = (part.strip() for part in line.partition("="))
+            if not sep or key not in config:
+                raise ValueError(f"{path}:{nr}: expected 'select = ...', 'ignore = ...' or 'profile = ...'")
+            if key == "profile":
+                if value not in PROFILES:
+                    raise ValueError(f"{path}:{nr}: unknown profile: {value}")
+                config["profile"] = value
+            elif key == "select":
+                config["select"] = selectors([value])
+            else:
+                config["ignore"] += selectors([value])
+    return config
+
+
+def defaults():
+    """the levels of the defaults of the installation (folint/config.txt),
+    read once per process: [] or [its configuration]"""
+    global _defaults
+    if _defaults is None:
+        _defaults = [read_config(CONFIG)] if os.path.exists(CONFIG) else []
+    return _defaults
+
+
+def find_config(start=None):
+    """the project configuration file in `start` (the current directory by default)
+    or the nearest parent directory, None if there is none"""
+    folder = os.path.abspath(start or os.getcwd())
+    while True:
+        path = os.path.join(folder, PROJECT_CONFIG)
+        if os.path.isfile(path):
+            return path
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            return None
+        folder = parent
+
+
+def selection(select=None, ignore=(), config=None, project=True, start=None, profile=None):
+    """the Selection of the configuration files and the command line
+
+    Args:
+        select (List[str], optional): the selectors of --select; None for
+            those of the configuration files, [] selects no rule
+        ignore (List[str]): the selectors of --ignore
+        config (str, optional): the project configuration file, instead of
+            the one found by find_config()
+        project (bool): use a project configuration file
+        start (str, optional): the directory where the search for the project
+            configuration file starts (the current directory by default)
+        profile (str, optional): the profile of --profile-set, a key of
+            PROFILES; that of the configuration files (or full) if None
+
+    Returns:
+        Selection: the selected rules, None if all rules are selected
+
+    Raises:
+        ValueError: an unknown rule or profile, or a wrong configuration file
+    """
+    levels = list(defaults())
+    if project:
+        config = config or find_config(start)
+        if config:
+            levels.append(read_config(config))
+    if profile is not None and profile not in PROFILES:
+        raise ValueError(f"unknown profile: {profile}")
+    levels.append({"select": None if select is None else list(select), "ignore": list(ignore), "profile": profile})
+    chosen, ignored, profile = None, [], "full"
+    for level in levels:
+        if level["select"] is not None:
+            chosen = level["select"]
+        ignored += level["ignore"]
+        profile = level["profile"] or profile
+    if chosen is None and not ignored and profile == "full":
+        return None
+    pairs = {(rule, soort) for rule, r in RULES.items() for soort in r.severities}
+    reasons = {}
+    if chosen is not None:
+        pairs = set().union(*(matches(s) for s in chosen))
+    for s in ignored:
+        removed = pairs & matches(s)
+        pairs -= removed
+        reasons.update((rule, "ignored") for rule, _ in removed)
+    for rule, soort in list(pairs):
+        cost = RULES[rule].cost
+        if cost not in PROFILES[profile]:
+            pairs.remove((rule, soort))
+            reasons[rule] = f"{cost} cost, not in the {profile} profile"
+    return Selection(pairs, reasons)
@@ -0,0 +1,133 @@
+# shard.py
+"""
+    Splitting a lint run over several CI jobs (`folint --shard i/n`)
+
+    The files are partitioned deterministically over n shards, so that the
+    shards have about the same cost.  The cost of a file is its time in a
+    timing file of earlier runs (`--timings`), or else estimated from its
+    size.
+
+    Every shard saves its results with `--save-results FILE`;
+    `folint --merge FILE...` reports the results of all shards as one run,
+    in the order of the unsharded run, with the same totals.  The shards
+    only read the timing file (they must all make the same partition);
+    --merge, or an unsharded run, updates it.
+"""
+
+import json
+import os
+
+from . import __version__
+
+
+def parse_shard(text):
+    """parses 'i/n' (1 <= i <= n) to (i, n)"""
+    try:
+        i, n = (int(x) for x in text.split("/"))
+    except ValueError:
+        raise ValueError(f"expected i/n, got {text!r}")
+    if not 1 <= i <= n:
+        raise ValueError(f"expected 1 <= i <= n, got {text!r}")
+    return i, n
+
+
+def read_timings(path):
+    """Dict[str, float]: the time per file of earlier runs, {} if `path` does not exist
+
+    Raises:
+        OSError: the file cannot be read
+        ValueError: the file is not a timing file
+    """
+    try:
+        with open(path) as f:
+            timings = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        raise ValueError(f"{path}: not a timing file ({e})")
+    if not isinstance(timings, dict):
+        raise ValueError(f"{path}: not a timing file")
+    return timings
+
+
+def write_timings(path, timings):
+    """adds `timings` to the timing file `path`"""
+    out = read_timings(path)
+    out.update(timings)
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, "w") as f:
+        json.dump(out, f, indent=1, sort_keys=True)
+    os.replace(temp, path)
+
+
+def costs(files, timings=None):
+    """the estimated cost of each file: its earlier time, or its size
+
+    The size of a file without timing is converted to seconds with the
+    average time per byte of the files with a timing.
+    """
+    timings = timings or {}
+    sizes = {}
+    for f in files:
+        try:
+            sizes[f] = os.path.getsize(f)
+        except OSError:
+            sizes[f] = 0
+    known = [f for f in files if f in timings]
+    per_byte = 1.0
+    if known and sum(sizes[f] for f in known):
+        per_byte = sum(timings[f] for f in known) / sum(sizes[f] for f in known)
+    return [timings[f] if f in timings else sizes[f] * per_byte for f in files]
+
+
+def partition(files, n, cost):
+    """divides `files` over n shards with about the same total cost
+
+    Greedy: the most expensive file first, to the shard with the lowest
+    cost so far (ties by name and shard number, so it is deterministic).
+
+    Returns:
+        List[List[int]]: the indices in `files` of each shard, in increasing order
+    """
+    shards = [[] for _ in range(n)]
+    loads = [0.0] * n
+    for i in sorted(range(len(files)), key=lambda i: (-cost[i], files[i])):
+        s = min(range(n), key=lambda s: (loads[s], s))
+        shards[s].append(i)
+        loads[s] += cost[i]
+    return [sorted(s) for s in shards]
+
+
+def save_results(path, shard, nfiles, results):
+    """saves the results of a (sharded) run
+
+    Args:
+        shard (Tuple[int, int], optional): i and n of --shard
+        nfiles (int): the number of files of the unsharded run
+        results (List[Dict]): per file: index (in the unsharded run), file,
+            aantal, events (of a Recorder) and time
+    """
+    with open(path, "w") as f:
+        json.dump({"version": __version__, "shard": shard, "files": nfiles,
+                   "results": results}, f, ensure_ascii=False)
+
+
+def load_results(paths):
+    """the results of the files of all shards, in the order of the unsharded run
+
+    Returns:
+        Tuple[int, List[Dict]]: the number of files of the unsharded run,
+            and the results
+    """
+    results, nfiles = [], 0
+    for path in paths:
+        with open(path) as f:
+            data = json.load(f)
+        nfiles = max(nfiles, data["files"])
+        results.extend(data["results"])
+    results.sort(key=lambda r: r["index"])
+    for r, s in zip(results, results[1:]):
+        if r["index"] == s["index"]:
+            raise ValueError(f"{r['file']} is in more than one result file"
+                             " (were the shards made with the same files and timings?)")
+    return nfiles, results
@@ -0,0 +1,74 @@
+# watch.py
+"""
+    Watch mode (`folint --watch PATH...`)
+
+    The parser stays loaded; the files are polled (modification time and
+    size, standard library only) and only the files that changed are linted
+    again.  The number of warnings/errors of the other files is kept, so
+    that the total after every round is that of all the watched files.
+    With -j, the changed files are linted in a pool of worker processes
+    that is reused in every round (see batch.py).
+"""
+
+import os
+import time
+
+from .batch import default_method, expand_paths, run_batch
+from .report import make_reporter, replay
+
+
+def signature(file):
+    """the modification time and size of `file`, None if it does not exist"""
+    try:
+        st = os.stat(file)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def watch(args, interval=0.5):
+    """lints the files of `args.FILE` again, every time they change, until Ctrl-C
+
+    Args:
+        args (argparse.Namespace): the command line options
+        interval (float): seconds between two polls
+    """
+    from .SCA import PRELOAD, lint_file, lint_worker, load_parser
+    load_parser()
+    seen = {}       # {file: signature}
+    results = {}    # {file: aantal}, van de laatste keer dat de file gelint is
+    first = True
+    try:
+        while True:
+            files = expand_paths(args.FILE)     # ook nieuwe files in de mappen
+            signatures = {f: signature(f) for f in files}
+            changed = [f for f in files if signatures[f] != seen.get(f)]
+            removed = [f for f in seen if f not in signatures]
+            if changed or removed or first:
+                reporter = make_reporter(args)
+                reporter.begin(len(files))
+                reporter.message(f"\n[{time.strftime('%H:%M:%S')}] {len(changed)} changed, "
+                                 f"{len(removed)} removed, {len(files)} files")
+                if args.jobs != 1 and len(changed) > 1:
+                    jobs = [(f, args, None, None) for f in changed]
+                    for f, events, aantal, _, _, _ in run_batch(lint_worker, jobs, args.jobs,
+                                                                args.start_method or default_method(),
+                                                                PRELOAD):
+                        reporter.file(f)
+                        replay(events, reporter)
+                        results[f] = aantal
+                else:
+                    for f in changed:
+                        reporter.file(f)
+                        results[f], _ = lint_file(f, args, reporter)
+                for f in removed:
+                    results.pop(f, None)
+                    seen.pop(f)
+                seen.update(signatures)     # gewijzigd tijdens het linten: volgende ronde opnieuw
+                reporter.end(sum(results[f] for f in files),
+                             skipped=args.rules.skipped if args.rules else None)
+                reporter.stream.flush()
+                first = False
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
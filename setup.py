@@ -1,6 +1,7 @@
 import pathlib
 from importlib_metadata import entry_points
 from setuptools import find_packages, setup
+from setuptools.command.build_py import build_py
 
 # The directory containing this file
 HERE = pathlib.Path(__file__).parent
@@ -8,6 +9,27 @@ HERE = pathlib.Path(__file__).parent
 # The text of the README file
 README = (HERE / "README.md").read_text()
 
+
+class BuildWithGrammar(build_py):
+    """build_py that also compiles the FO(.) grammar (ast_engine/Idp.tx.pickle),
+    see folint/ast_engine/Grammar.py; needs textX in the build environment"""
+
+    def run(self):
+        super().run()
+        import importlib.util
+        spec = importlib.util.spec_from_file_location(
+            "folint_grammar", HERE / "folint" / "ast_engine" / "Grammar.py")
+        grammar = importlib.util.module_from_spec(spec)
+        try:
+            spec.loader.exec_module(grammar)    # zonder folint zelf te importeren
+        except ImportError as e:
+            self.warn(f"grammar not compiled ({e}); folint compiles it in the user cache on first use")
+            return
+        tx = pathlib.Path(self.build_lib) / "folint" / "ast_engine" / "Idp.tx"
+        self.announce(f"compiling {tx}", level=2)
+        grammar.compile_grammar(str(tx))
+
+
 # This call to setup() does all the work
 setup(
     name="folint",
@@ -24,9 +46,11 @@ setup(
       ],
     packages=find_packages(),
     include_package_data=True, 
-    package_data={'': ['ast_engine/Idp.tx']},
+    package_data={'': ['ast_engine/Idp.tx', 'ast_engine/Idp.tx.pickle', 'config.txt']},
     install_requires=["textX","z3-solver"],
+    cmdclass={"build_py": BuildWithGrammar},
     entry_points = {
-      'console_scripts': ['folint=folint.SCA:main']
+      'console_scripts': ['folint=folint.SCA:main',
+                          'folint-client=folint.client:main']
     }
 )
\ No newline at end of file